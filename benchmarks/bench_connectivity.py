@@ -0,0 +1,83 @@
+"""
+Compare the line-of-sight connectivity engine with the BFS that
+Board.can_connect used before it, per query and across board sizes.
+
+    python benchmarks/bench_connectivity.py
+"""
+
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from connectivity import find_path
+
+BOARD_SIZES = [(14, 7), (28, 14), (56, 28), (112, 56)]
+FILL_RATIO = 0.6
+QUERIES = 2000
+
+def bfs_path(grid, width, height, x1, y1, x2, y2):
+    # The previous Board.can_connect search, kept as the reference
+    pos1 = (x1, y1)
+    pos2 = (x2, y2)
+    queue = deque([(pos1, -1, -1, [pos1])])
+    visited = set()
+    while queue:
+        (x, y), prev_dir, turns, path = queue.popleft()
+        if (x, y) == pos2:
+            return path
+        if turns > 1:
+            continue
+        state = (x, y, prev_dir, turns)
+        if state in visited:
+            continue
+        visited.add(state)
+        for i, (dx, dy) in enumerate([(0, -1), (1, 0), (0, 1), (-1, 0)]):
+            nx, ny = x + dx, y + dy
+            if nx < -1 or nx > width or ny < -1 or ny > height:
+                continue
+            if (nx, ny) != pos2:
+                if 0 <= nx < width and 0 <= ny < height and grid[ny][nx] is not None:
+                    continue
+            new_turns = turns
+            if prev_dir != -1 and prev_dir != i:
+                new_turns += 1
+            if new_turns <= 1:
+                queue.append(((nx, ny), i, new_turns, path + [(nx, ny)]))
+    return None
+
+def path_length(path):
+    return sum(abs(bx - ax) + abs(by - ay) for (ax, ay), (bx, by) in zip(path, path[1:]))
+
+def make_case(width, height, rng):
+    grid = [[0 if rng.random() < FILL_RATIO else None for _ in range(width)]
+            for _ in range(height)]
+    occupied = [(x, y) for y in range(height) for x in range(width) if grid[y][x] is not None]
+    queries = [tuple(rng.sample(occupied, 2)) for _ in range(QUERIES)]
+    return grid, queries
+
+def time_queries(search, grid, width, height, queries):
+    start = time.perf_counter()
+    results = [search(grid, width, height, a[0], a[1], b[0], b[1]) for a, b in queries]
+    return time.perf_counter() - start, results
+
+def main():
+    rng = random.Random(1234)
+    print(f"{'board':>9} {'bfs us/query':>13} {'engine us/query':>16} {'speedup':>8}")
+    for width, height in BOARD_SIZES:
+        grid, queries = make_case(width, height, rng)
+        bfs_time, expected = time_queries(bfs_path, grid, width, height, queries)
+        engine_time, actual = time_queries(find_path, grid, width, height, queries)
+
+        for want, got in zip(expected, actual):
+            if (want is None) != (got is None) or (want and path_length(want) != path_length(got)):
+                raise SystemExit(f"Mismatch on {width}x{height}: {want} != {got}")
+
+        print(f"{width:>4}x{height:<4} {bfs_time / QUERIES * 1e6:>13.1f} "
+              f"{engine_time / QUERIES * 1e6:>16.1f} {bfs_time / engine_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
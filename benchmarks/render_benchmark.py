@@ -0,0 +1,300 @@
+"""
+Frame-rate benchmark of the whole game under the dummy SDL video driver.
+main's loop runs with an unlocked frame rate while a script plays a seeded
+game through the start screen, matches, hints, shuffles, window resizes,
+the auto-solver and the fireworks screen, and the frame times of each
+scene are reported as FPS and percentiles.
+
+    python benchmarks/render_benchmark.py
+    python benchmarks/render_benchmark.py --output render.json
+    python benchmarks/render_benchmark.py --save-script script.json
+    python benchmarks/render_benchmark.py --script script.json
+
+By default the script is generated while playing, by looking at the board.
+--save-script records the steps it took, and --script replays such a
+recording frame by frame. The board is seeded and its background searches
+use node budgets instead of time limits, so a replay sees the same boards
+on every run. Frames spent waiting for a resize to settle or for the
+background worker do not advance the replay, since those waits depend on
+the machine rather than on the frame count; they are left out of the
+statistics and reported as waiting frames. The auto-solver keeps animating
+during those waits, so the solve and fireworks scenes can still differ by
+a frame or two between runs.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import pygame
+
+import main as game
+from frame_profiler import percentile
+
+SEED = 2024
+START_FRAMES = 300
+MATCHES = 20
+HINTS = 5
+SHUFFLES = 3
+SHUFFLE_FRAMES = 30  # Frames drawn after each shuffle
+RESIZE_SIZES = [(900, 650), (1600, 1000), (game.INITIAL_WIDTH, game.INITIAL_HEIGHT)]
+RESIZE_STEPS = 10  # Resize events per simulated window drag
+RESIZE_HOLD_FRAMES = 60  # Frames drawn at each new size
+FIREWORK_FRAMES = 600
+WAIT_LIMIT = 5000  # Frames to wait for the game before giving up on a step
+
+# Script steps are plain dicts so a run can be saved and replayed:
+#   {"type": "click", "pos": [x, y]}
+#   {"type": "resize", "size": [w, h]}
+#   {"type": "shuffle"}  (no button for it, so it calls Board.shuffle_board)
+
+def click(pos):
+    return {"type": "click", "pos": list(pos)}
+
+def apply_steps(info, steps):
+    """Events for the steps; actions without an input event run right away"""
+    events = []
+    for step in steps:
+        if step["type"] == "click":
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=tuple(step["pos"]), button=1))
+        elif step["type"] == "resize":
+            w, h = step["size"]
+            events.append(pygame.event.Event(pygame.VIDEORESIZE, w=w, h=h, size=(w, h)))
+        elif step["type"] == "shuffle":
+            if info.board:
+                info.board.shuffle_board()
+        else:
+            raise ValueError(f"Unknown script step {step['type']!r}")
+    return events
+
+def clock_paused(info):
+    # Waits measured in time rather than frames; the script clock stops so
+    # recordings replay in step however long they take
+    board = info.board
+    return info.resizing or bool(board and (board.analysis_pending or board.solve_pending))
+
+def board_ready(board):
+    # Nothing in progress that would swallow or delay a click
+    return not (board.animating or board.failed_match_timer or board.hint_timer
+                or board.auto_solving or board.solve_pending or board.analysis_pending)
+
+class GeneratedScript:
+    """Plays a seeded game by looking at the board, recording every step"""
+    def __init__(self):
+        self.info = None
+        self.steps = self.play()
+        self.clock = 0  # Frames not spent waiting, see clock_paused
+        self.recording = []
+
+    def __call__(self, info):
+        self.info = info
+        try:
+            scene, steps = next(self.steps)
+        except StopIteration:
+            self.recording.append({"frame": self.clock, "paused": None, "end": True})
+            return None
+        paused = clock_paused(info)
+        if steps or not self.recording or self.recording[-1]["scene"] != scene:
+            self.recording.append({"frame": self.clock, "paused": paused,
+                                   "scene": scene, "steps": steps})
+        if not paused:
+            self.clock += 1
+        return scene, steps
+
+    def wait(self, scene, condition):
+        for _ in range(WAIT_LIMIT):
+            if condition(self.info):
+                return
+            yield scene, []
+        raise RuntimeError(f"Gave up waiting in scene {scene!r}")
+
+    def play(self):
+        for _ in range(START_FRAMES):
+            yield "start", []
+        yield "start", [click(self.info.start_button.center)]
+        yield from self.wait("start", lambda info: info.game_state == game.PLAYING)
+
+        for _ in range(MATCHES):
+            yield from self.wait("match", lambda info: board_ready(info.board) and info.board.live_moves)
+            board = self.info.board
+            (x1, y1), (x2, y2) = min(board.live_moves)
+            yield "match", [click(board.tiles[y1][x1].rect.center)]
+            yield "match", [click(board.tiles[y2][x2].rect.center)]
+            yield from self.wait("match", lambda info: board_ready(info.board))
+
+        for _ in range(HINTS):
+            yield "hint", [click(self.info.board.hint_button.center)]
+            yield from self.wait("hint", lambda info: board_ready(info.board))
+
+        for _ in range(SHUFFLES):
+            yield "shuffle", [{"type": "shuffle"}]
+            for _ in range(SHUFFLE_FRAMES):
+                yield "shuffle", []
+
+        for target in RESIZE_SIZES:
+            # A drag from the current size to the target, one event a frame
+            start_w, start_h = self.info.window_size
+            for i in range(1, RESIZE_STEPS + 1):
+                w = start_w + (target[0] - start_w) * i // RESIZE_STEPS
+                h = start_h + (target[1] - start_h) * i // RESIZE_STEPS
+                yield "resize", [{"type": "resize", "size": [w, h]}]
+            yield from self.wait("resize", lambda info: not info.resizing)
+            for _ in range(RESIZE_HOLD_FRAMES):
+                yield "resize", []
+
+        yield "solve", [click(self.info.board.solve_button.center)]
+        yield from self.wait("solve", lambda info: info.game_state == game.END_SCREEN)
+
+        for _ in range(FIREWORK_FRAMES):
+            yield "fireworks", []
+
+class ReplayScript:
+    """Replays a recording of GeneratedScript frame by frame"""
+    def __init__(self, recording):
+        self.entries = list(recording)
+        self.clock = 0
+        self.scene = None
+        self.stalled = 0  # Paused frames in a row without an entry firing
+
+    def due(self, entry, paused):
+        # The clock stands still during a pause, so an entry on the current
+        # frame also has to match whether it was recorded during one or just
+        # after it. A pause can end sooner than it did in the recording, so
+        # an entry the clock has already passed fires regardless.
+        if entry["frame"] < self.clock:
+            return True
+        return entry["frame"] == self.clock and entry.get("paused", False) in (paused, None)
+
+    def __call__(self, info):
+        steps = []
+        paused = clock_paused(info)
+        if self.entries and self.due(self.entries[0], paused):
+            entry = self.entries.pop(0)
+            if entry.get("end"):
+                return None
+            self.scene = entry["scene"]
+            steps = entry["steps"]
+            self.stalled = 0
+        elif paused:
+            self.stalled += 1
+            if self.stalled >= WAIT_LIMIT:
+                raise RuntimeError(f"Replay stuck in scene {self.scene!r} at frame {self.clock}")
+        if not paused:
+            self.clock += 1
+        return self.scene, steps
+
+class SceneTimer:
+    """
+    Wraps a script for run_game and times every frame by scene. Frames
+    that start and end with the script clock paused are only counted,
+    because how many there are depends on the machine and would skew the
+    statistics. The frame that ends a pause, such as the one applying a
+    resize, is timed like any other.
+    """
+    def __init__(self, script):
+        self.script = script
+        self.frame_times = {}  # scene -> frame times in ms, in play order
+        self.waiting_frames = {}  # scene -> frames drawn during a pause
+        self.scene = None
+        self.paused = False
+        self.last = None
+
+    def __call__(self, info):
+        now = time.perf_counter()
+        paused = clock_paused(info)
+        if self.last is not None:
+            if self.paused and paused:
+                self.waiting_frames[self.scene] = self.waiting_frames.get(self.scene, 0) + 1
+            else:
+                self.frame_times.setdefault(self.scene, []).append((now - self.last) * 1000)
+        self.paused = paused
+        result = self.script(info)
+        if result is None:
+            return None
+        self.scene, steps = result
+        # Stepping the script is not part of the frame, but the steps are:
+        # a scripted shuffle runs here, inside the frame it belongs to
+        self.last = time.perf_counter()
+        return apply_steps(info, steps)
+
+def summarize(frame_times, waiting_frames):
+    results = {}
+    for scene, times in frame_times.items():
+        ordered = sorted(times)
+        total = sum(times)
+        results[scene] = {
+            "frames": len(times),
+            "waiting_frames": waiting_frames.get(scene, 0),
+            "fps": len(times) / total * 1000 if total else 0.0,
+            "avg_ms": total / len(times),
+            "p50_ms": percentile(ordered, 0.50),
+            "p95_ms": percentile(ordered, 0.95),
+            "p99_ms": percentile(ordered, 0.99),
+            "max_ms": ordered[-1],
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frame times of scripted play")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--script", help="replay this recorded script instead of generating one")
+    parser.add_argument("--save-script", help="record the generated script to this JSON file")
+    parser.add_argument("--seed", type=int, default=SEED, help="board seed (default: 2024)")
+    parser.add_argument("--fps", type=int, default=0,
+                        help="frame rate cap, 0 for unlocked (default: 0)")
+    args = parser.parse_args()
+
+    if args.script:
+        with open(args.script) as f:
+            recorded = json.load(f)
+        script = ReplayScript(recorded["frames"])
+        seed = recorded.get("seed", args.seed)
+    else:
+        script = GeneratedScript()
+        seed = args.seed
+
+    # Assets are looked up relative to the working directory
+    os.chdir(ROOT)
+    # Hints, fireworks and the start screen layout use the global generator
+    random.seed(seed)
+    timer = SceneTimer(script)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.run_game(fps=args.fps, script=timer, board_seed=seed, play_music=False,
+                      time_limits=False)
+
+    results = summarize(timer.frame_times, timer.waiting_frames)
+    print(f"{'scene':<12}{'frames':>8}{'wait':>7}{'fps':>10}{'avg':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for scene, result in results.items():
+        print(f"{scene:<12}{result['frames']:>8}{result['waiting_frames']:>7}{result['fps']:>10.1f}{result['avg_ms']:>9.2f}"
+              f"{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+              f"{result['max_ms']:>9.2f}")
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "seed": seed,
+            "scenes": results,
+        }
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    if args.save_script and isinstance(script, GeneratedScript):
+        with open(args.save_script, "w") as output:
+            json.dump({"seed": seed, "frames": script.recording}, output, indent=1)
+        print(f"Script written to {args.save_script}")
+
+if __name__ == "__main__":
+    main()
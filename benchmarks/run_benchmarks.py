@@ -0,0 +1,195 @@
+"""
+Timing suite for the Board hot paths on seeded boards, from the standard
+14x7 board up to much larger ones. Runs under the dummy SDL video driver,
+writes the results as JSON and compares them with a stored baseline.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --update-baseline
+
+Exits with status 1 when a case is slower than the baseline by more than
+the tolerance. Timings depend on the machine, so refresh the baseline with
+--update-baseline when moving to a different one.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pygame
+
+from board import Board
+from generator import generate_layout
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BOARD_SIZES = [(14, 7), (28, 14), (56, 28)]
+SEED = 2024
+TILE_WIDTH = 12
+TILE_HEIGHT = 16
+# Share of the solution played before measuring, so searches see a
+# half-cleared board rather than a full one
+CLEARED_RATIO = 0.5
+REPEATS = 5
+TOLERANCE = 0.25  # Allowed slowdown against the baseline
+
+def make_board(width, height):
+    # Seeded board with part of its solution already played
+    grid, solution = generate_layout(width, height, seed=SEED)
+    for (x1, y1), (x2, y2) in solution[:int(len(solution) * CLEARED_RATIO)]:
+        grid[y1][x1] = grid[y2][x2] = None
+    return Board(width, height, TILE_WIDTH, TILE_HEIGHT, seed=SEED, layout=grid)
+
+def tile_pairs(board, count):
+    rng = random.Random(SEED)
+    tiles = [tile for row in board.tiles for tile in row if tile]
+    return [tuple(rng.sample(tiles, 2)) for _ in range(count)]
+
+def bench_can_connect(board):
+    pairs = tile_pairs(board, 4000)
+    def run():
+        for tile1, tile2 in pairs:
+            board.can_connect(tile1, tile2)
+    return run, len(pairs)
+
+def bench_can_connect_test(board):
+    pairs = [((a.x, a.y), (b.x, b.y)) for a, b in tile_pairs(board, 4000)]
+    visible_grid = [[True if tile else False for tile in row] for row in board.tiles]
+    def run():
+        for (x1, y1), (x2, y2) in pairs:
+            board.can_connect_test(x1, y1, x2, y2, visible_grid)
+    return run, len(pairs)
+
+def bench_has_valid_move(board):
+    def run():
+        for _ in range(50):
+            board.has_valid_move(board.tiles)
+    return run, 50
+
+def bench_show_hint(board):
+    def run():
+        for _ in range(2000):
+            board.show_hint()
+    return run, 2000
+
+def bench_generate_solvable_board(board):
+    def run():
+        for _ in range(3):
+            board.generate_solvable_board()
+    return run, 3
+
+def bench_shuffle_board(board):
+    def run():
+        # shuffle_board reports every shuffle on stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(3):
+                board.shuffle_board()
+    return run, 3
+
+CASES = [
+    ("can_connect", bench_can_connect),
+    ("can_connect_test", bench_can_connect_test),
+    ("has_valid_move", bench_has_valid_move),
+    ("show_hint", bench_show_hint),
+    ("generate_solvable_board", bench_generate_solvable_board),
+    ("shuffle_board", bench_shuffle_board),
+]
+
+def run_case(board, make_run, repeats):
+    # Every repeat starts from the same board and the same random state
+    grid = board.get_type_grid()
+    timings = []
+    for _ in range(repeats):
+        board.rng.seed(SEED)
+        random.seed(SEED)
+        run, ops = make_run(board)
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) / ops)
+        board.load_layout(grid)
+    return {"us_per_op": statistics.median(timings) * 1e6,
+            "min_us_per_op": min(timings) * 1e6,
+            "ops": ops, "repeats": repeats}
+
+def run_suite(sizes, repeats):
+    results = {}
+    for width, height in sizes:
+        board = make_board(width, height)
+        try:
+            for name, make_run in CASES:
+                key = f"{name}/{width}x{height}"
+                results[key] = run_case(board, make_run, repeats)
+                print(f"{key:<34} {results[key]['us_per_op']:>12.1f} us/op")
+        finally:
+            board.analysis_worker.stop()
+    return results
+
+def compare(results, baseline, tolerance):
+    """Names of the cases slower than the baseline by more than the tolerance"""
+    # The fastest repeat is the least disturbed by other load on the machine
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        ratio = result["min_us_per_op"] / reference["min_us_per_op"]
+        if ratio > 1 + tolerance:
+            regressions.append(key)
+            print(f"REGRESSION {key}: {reference['min_us_per_op']:.1f} -> "
+                  f"{result['min_us_per_op']:.1f} us/op ({ratio:.2f}x)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Board hot paths")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown, as a fraction (default: 0.25)")
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--quick", action="store_true", help="only the 14x7 board")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    sizes = BOARD_SIZES[:1] if args.quick else BOARD_SIZES
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "results": run_suite(sizes, args.repeats),
+    }
+    pygame.quit()
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    if args.update_baseline:
+        with open(args.baseline, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return
+    with open(args.baseline) as baseline:
+        regressions = compare(report["results"], json.load(baseline)["results"], args.tolerance)
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Rasterize the tile SVGs into one atlas PNG per resolution level, plus a
+manifest of where every tile sits, so the game loads a few PNGs at start-up
+instead of parsing 34 SVGs.
+Run again whenever a file in assets/tiles changes.
+"""
+
+import io
+import json
+import os
+import re
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+SVG_DIR = "assets/tiles"
+ATLAS_DIR = "assets/atlas"
+TILE_TYPES = 34
+COLUMNS = 9
+# From the smallest board tile up to 2x the 60x80 base size
+LEVELS = [(30, 40), (60, 80), (90, 120), (120, 160)]
+MANIFEST_VERSION = 1
+
+def rasterize(svg_path, width, height):
+    # Render the vector art straight at the target size by rewriting the
+    # root element's width and height; the viewBox scales the drawing
+    with open(svg_path, "rb") as f:
+        svg = f.read()
+    root = re.search(rb"<svg\b[^>]*>", svg)
+    tag = root.group(0)
+    tag = re.sub(rb'(\s)width="[^"]*"', rb'\g<1>width="%d"' % width, tag, count=1)
+    tag = re.sub(rb'(\s)height="[^"]*"', rb'\g<1>height="%d"' % height, tag, count=1)
+    svg = svg[:root.start()] + tag + svg[root.end():]
+    image = pygame.image.load(io.BytesIO(svg), "tile.svg")
+    if image.get_size() != (width, height):
+        image = pygame.transform.smoothscale(image.convert_alpha(), (width, height))
+    return image
+
+def build_level(width, height):
+    rows = (TILE_TYPES + COLUMNS - 1) // COLUMNS
+    atlas = pygame.Surface((COLUMNS * width, rows * height), pygame.SRCALPHA)
+    tiles = {}
+    for tile_type in range(TILE_TYPES):
+        x = (tile_type % COLUMNS) * width
+        y = (tile_type // COLUMNS) * height
+        image = rasterize(os.path.join(SVG_DIR, f"{tile_type}.svg"), width, height)
+        atlas.blit(image, (x, y))
+        tiles[str(tile_type)] = [x, y, width, height]
+
+    filename = f"tiles_{width}x{height}.png"
+    pygame.image.save(atlas, os.path.join(ATLAS_DIR, filename))
+    print(f"Wrote {filename}")
+    return {"file": filename, "width": width, "height": height, "tiles": tiles}
+
+def build_tile_atlas():
+    pygame.init()
+    # convert_alpha needs a display, even a hidden one
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "levels": [build_level(width, height) for width, height in LEVELS],
+    }
+    with open(os.path.join(ATLAS_DIR, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    pygame.quit()
+    print(f"\nAtlas build complete! Files saved in {ATLAS_DIR}")
+
+if __name__ == "__main__":
+    build_tile_atlas()
@@ -20,6 +20,7 @@ if errorlevel 1 (
 REM Install required packages
 echo Installing required packages...
 pip install pygame==2.5.2
+pip install numpy
 pip install pyinstaller
 
 REM Build the executable
@@ -22,7 +22,7 @@ if errorlevel 1 (
 
 REM 安裝依賴
 echo Step 3: Installing dependencies...
-pip install pygame==2.5.2 pyinstaller
+pip install pygame==2.5.2 numpy pyinstaller
 if errorlevel 1 (
     echo Error: Failed to install dependencies
     pause
@@ -35,6 +35,7 @@ pyinstaller ^
     --onefile ^
     --noconsole ^
     --add-data "assets/tiles/*.svg;assets/tiles" ^
+    --add-data "assets/atlas/*;assets/atlas" ^
     --add-data "assets/audio/*.mp3;assets/audio" ^
     --hidden-import pygame ^
     --name mahjong-link-game ^
@@ -22,7 +22,7 @@ if errorlevel 1 (
 
 REM 安裝依賴
 echo Step 3: Installing dependencies...
-pip install pygame==2.5.2 pyinstaller
+pip install pygame==2.5.2 numpy pyinstaller
 if errorlevel 1 (
     echo Error: Failed to install dependencies
     pause
@@ -0,0 +1,120 @@
+"""
+Background analysis so the game loop never waits on a board search.
+
+The board sends a snapshot (a copy of its tile type grid plus whatever the
+job needs) tagged with its current revision. A daemon thread answers with
+an AnalysisResult carrying the same revision. The board bumps its revision
+on every change to the tiles, so any result whose revision no longer
+matches is stale and is simply dropped.
+"""
+
+import queue
+import random
+import threading
+import traceback
+
+from moves import build_type_index, find_moves, update_moves
+from shuffle import CANDIDATE_TIME_LIMIT, shuffle_types
+from solver import DEFAULT_TIME_LIMIT, Solver
+
+# Job kinds
+ANALYZE = "analyze"
+SOLVE = "solve"
+
+class BoardSnapshot:
+    def __init__(self, revision, width, height, grid, live_moves=None, freed=None,
+                 ensure_solvable=False, time_limits=True):
+        self.revision = revision
+        self.width = width
+        self.height = height
+        self.grid = grid  # Copy of the tile type grid, None for empty cells
+        self.live_moves = live_moves  # Connectable pairs before freed were removed
+        self.freed = freed or []
+        self.ensure_solvable = ensure_solvable  # Only accept clearable shuffles
+        # Searches stop on wall-clock time as well as node budgets; without
+        # time limits the answer only depends on the snapshot and the rng
+        self.time_limits = time_limits
+
+class AnalysisResult:
+    def __init__(self, kind, revision, live_moves=None, shuffled_types=None,
+                 solve_result=None):
+        self.kind = kind
+        self.revision = revision
+        self.live_moves = live_moves
+        # Types for the occupied positions in row-major order when the board
+        # was dead and had to be shuffled, otherwise None
+        self.shuffled_types = shuffled_types
+        self.solve_result = solve_result
+
+def analyze(snapshot, rng):
+    """Update the live-move set after a removal and shuffle a dead board"""
+    type_positions = build_type_index(snapshot.grid, snapshot.width, snapshot.height)
+    if snapshot.live_moves is None:
+        live_moves = set(find_moves(snapshot.grid, snapshot.width, snapshot.height,
+                                    type_positions))
+    else:
+        live_moves = update_moves(snapshot.grid, snapshot.width, snapshot.height,
+                                  type_positions, set(snapshot.live_moves), snapshot.freed)
+
+    shuffled = None
+    if not live_moves and type_positions:
+        time_limit = CANDIDATE_TIME_LIMIT if snapshot.time_limits else None
+        shuffled, shuffled_moves, _ = shuffle_types(snapshot.grid, snapshot.width, snapshot.height,
+                                                    rng, snapshot.ensure_solvable,
+                                                    time_limit=time_limit)
+        if shuffled:
+            live_moves = shuffled_moves
+    return AnalysisResult(ANALYZE, snapshot.revision, live_moves, shuffled)
+
+def solve(snapshot, rng):
+    """Search a full solution for the snapshot"""
+    time_limit = DEFAULT_TIME_LIMIT if snapshot.time_limits else None
+    result = Solver(time_limit=time_limit).solve(snapshot.grid, snapshot.width, snapshot.height)
+    return AnalysisResult(SOLVE, snapshot.revision, solve_result=result)
+
+JOBS = {
+    ANALYZE: analyze,
+    SOLVE: solve,
+}
+
+class AnalysisWorker:
+    def __init__(self, seed=None):
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.latest_revision = {}
+        # Background shuffles of a seeded board repeat between runs
+        self.rng = random.Random(seed)
+        self.thread = threading.Thread(target=self.run, name="board-analysis", daemon=True)
+        self.thread.start()
+
+    def submit(self, kind, snapshot):
+        self.latest_revision[kind] = snapshot.revision
+        self.requests.put((kind, snapshot))
+
+    def poll(self):
+        # Non-blocking: every result finished since the last call
+        results = []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def stop(self):
+        self.requests.put(None)
+
+    def run(self):
+        while True:
+            job = self.requests.get()
+            if job is None:
+                return
+            kind, snapshot = job
+            # A newer snapshot of the same kind is already queued, so the
+            # board would discard this answer anyway
+            if snapshot.revision < self.latest_revision.get(kind, snapshot.revision):
+                continue
+            try:
+                self.results.put(JOBS[kind](snapshot, self.rng))
+            except Exception:
+                traceback.print_exc()
+                self.results.put(AnalysisResult(kind, snapshot.revision))
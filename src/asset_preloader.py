@@ -0,0 +1,39 @@
+"""
+Warm-up of the tile sprite caches on worker threads.
+
+main() starts one while the start screen is showing, so by the time the
+player clicks start every tile type is already decoded and composed at the
+board's tile size and the first board is drawn without a decode stall.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from generator import TILE_TYPE_COUNT
+from tile_sprites import get_tile_sprites
+
+PRELOAD_WORKERS = min(4, os.cpu_count() or 1)
+
+class AssetPreloader:
+    """Builds the sprites of every tile type at one tile size in the background"""
+    def __init__(self, tile_width, tile_height, workers=PRELOAD_WORKERS):
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        executor = ThreadPoolExecutor(max_workers=workers)
+        self.futures = [executor.submit(get_tile_sprites, tile_type, tile_width, tile_height)
+                        for tile_type in range(TILE_TYPE_COUNT)]
+        # Workers exit on their own once the queue is drained
+        executor.shutdown(wait=False)
+
+    def progress(self):
+        """Fraction of tile types finished, from 0.0 to 1.0"""
+        done = sum(1 for future in self.futures if future.done())
+        return done / len(self.futures)
+
+    def is_done(self):
+        return all(future.done() for future in self.futures)
+
+    def cancel(self):
+        # Drop the types no worker has picked up yet
+        for future in self.futures:
+            future.cancel()
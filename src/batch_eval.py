@@ -0,0 +1,194 @@
+"""
+Batched move counting for offline studies of board layouts.
+
+Takes a stack of boards as an (N, H, W) integer array, with tile types
+>= 0 and EMPTY (-1) for an empty cell, and counts the connectable pairs on
+every board with vectorized corridor checks. It follows the same rules as
+Board.can_connect, including paths through the border ring.
+
+Requires: pip install numpy
+
+    python src/batch_eval.py --count 2000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from generator import generate_layout
+from moves import build_type_index, find_moves
+
+EMPTY = -1
+# Boards evaluated together; bounds the size of the temporary arrays
+CHUNK_SIZE = 256
+
+def to_array(grids):
+    """Stack type grids (None for empty cells) into an (N, H, W) array"""
+    return np.array([[[EMPTY if cell is None else cell for cell in row] for row in grid]
+                     for grid in grids], dtype=np.int32)
+
+def _first_free(occupied, axis, reverse):
+    # For every cell, the furthest index reachable along an axis through
+    # empty cells, counting the padded border ring (index 0 and size - 1)
+    size = occupied.shape[axis]
+    shape = [1] * occupied.ndim
+    shape[axis] = size
+    index = np.arange(size).reshape(shape)
+    if not reverse:
+        blocker = np.where(occupied, index, -1)
+        blocker = np.maximum.accumulate(blocker, axis=axis)
+        # Nearest blocker strictly before each cell
+        before = np.full_like(blocker, -1)
+        slicer_dst = [slice(None)] * occupied.ndim
+        slicer_src = [slice(None)] * occupied.ndim
+        slicer_dst[axis] = slice(1, None)
+        slicer_src[axis] = slice(None, -1)
+        before[tuple(slicer_dst)] = blocker[tuple(slicer_src)]
+        return before + 1
+    blocker = np.where(occupied, index, size)
+    blocker = np.flip(np.minimum.accumulate(np.flip(blocker, axis), axis=axis), axis)
+    # Nearest blocker strictly after each cell
+    after = np.full_like(blocker, size)
+    slicer_dst = [slice(None)] * occupied.ndim
+    slicer_src = [slice(None)] * occupied.ndim
+    slicer_dst[axis] = slice(None, -1)
+    slicer_src[axis] = slice(1, None)
+    after[tuple(slicer_dst)] = blocker[tuple(slicer_src)]
+    return after - 1
+
+def _same_type_pairs(boards):
+    # Every unordered same-type pair (board, cell a, cell b) with a < b in
+    # row-major order. Sorting each board by type puts equal types next to
+    # each other, so pairs are entries a fixed distance apart in that order.
+    count, height, width = boards.shape
+    flat = boards.reshape(count, height * width)
+    order = np.argsort(flat, axis=1, kind="stable")
+    sorted_types = np.take_along_axis(flat, order, axis=1)
+    if sorted_types.shape[1] < 2:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    # The largest number of copies of one type on any board bounds the distance
+    tiles = flat[flat != EMPTY]
+    if tiles.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    type_span = int(tiles.max()) + 1
+    board_of_tile = np.nonzero(flat != EMPTY)[0]
+    max_copies = int(np.bincount(board_of_tile * type_span + tiles).max())
+    if max_copies < 2:
+        # No type appears twice on any board
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    boards_idx, first, second = [], [], []
+    for distance in range(1, max_copies):
+        same = ((sorted_types[:, :-distance] == sorted_types[:, distance:])
+                & (sorted_types[:, :-distance] != EMPTY))
+        n, k = np.nonzero(same)
+        boards_idx.append(n)
+        first.append(order[n, k])
+        second.append(order[n, k + distance])
+    return np.concatenate(boards_idx), np.concatenate(first), np.concatenate(second)
+
+def _count_chunk(boards):
+    count, height, width = boards.shape
+    # Pad with the always-empty border ring
+    occupied = np.zeros((count, height + 2, width + 2), dtype=bool)
+    occupied[:, 1:-1, 1:-1] = boards != EMPTY
+
+    left = _first_free(occupied, 2, False)
+    right = _first_free(occupied, 2, True)
+    top = _first_free(occupied, 1, False)
+    bottom = _first_free(occupied, 1, True)
+
+    # Prefix sums of occupied cells down each column and along each row
+    column_sums = np.zeros((count, height + 3, width + 2), dtype=np.int32)
+    column_sums[:, 1:, :] = np.cumsum(occupied, axis=1)
+    row_sums = np.zeros((count, height + 2, width + 3), dtype=np.int32)
+    row_sums[:, :, 1:] = np.cumsum(occupied, axis=2)
+
+    n, a, b = _same_type_pairs(boards)
+    if n.size == 0:
+        return np.zeros(count, dtype=np.int64)
+    r1, c1 = a // width + 1, a % width + 1
+    r2, c2 = b // width + 1, b % width + 1
+
+    # Middle segment along a column c that both tiles reach along their
+    # rows; the column must be empty strictly between the two rows
+    columns = np.arange(width + 2)
+    low = np.maximum(left[n, r1, c1], left[n, r2, c2])[:, None]
+    high = np.minimum(right[n, r1, c1], right[n, r2, c2])[:, None]
+    r_min, r_max = np.minimum(r1, r2), np.maximum(r1, r2)
+    blocked = column_sums[n, r_max, :] - column_sums[n, r_min + 1, :]
+    via_column = ((columns >= low) & (columns <= high) & (blocked == 0)).any(axis=1)
+    via_column &= r1 != r2
+
+    # Middle segment along a row both tiles reach along their columns
+    rows = np.arange(height + 2)
+    low = np.maximum(top[n, r1, c1], top[n, r2, c2])[:, None]
+    high = np.minimum(bottom[n, r1, c1], bottom[n, r2, c2])[:, None]
+    c_min, c_max = np.minimum(c1, c2), np.maximum(c1, c2)
+    blocked = row_sums[n, :, c_max] - row_sums[n, :, c_min + 1]
+    via_row = ((rows >= low) & (rows <= high) & (blocked == 0)).any(axis=1)
+    via_row &= c1 != c2
+
+    return np.bincount(n[via_column | via_row], minlength=count)
+
+def count_moves(boards, chunk_size=CHUNK_SIZE):
+    """Number of connectable same-type pairs on each board of an (N, H, W) array"""
+    boards = np.asarray(boards)
+    counts = [_count_chunk(boards[start:start + chunk_size])
+              for start in range(0, len(boards), chunk_size)]
+    return np.concatenate(counts) if counts else np.zeros(0, dtype=np.int64)
+
+def _sample_boards(count, width, height, seed):
+    # Generated boards with a random number of pairs already cleared
+    rng = random.Random(seed)
+    grids = []
+    for i in range(count):
+        grid, solution = generate_layout(width, height, rng=rng)
+        for (x1, y1), (x2, y2) in solution[:rng.randrange(len(solution))]:
+            grid[y1][x1] = grid[y2][x2] = None
+        grids.append(grid)
+    return grids
+
+def _edge_case_boards(width, height):
+    # Boards without a single same-type pair: one tile left, and every
+    # tile of a different type
+    single = [[None] * width for _ in range(height)]
+    single[0][0] = 0
+    distinct = [[y * width + x for x in range(width)] for y in range(height)]
+    return [single, distinct]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare batched and per-pair move counting")
+    parser.add_argument("--width", type=int, default=14)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    grids = _sample_boards(args.count, args.width, args.height, args.seed)
+    grids.extend(_edge_case_boards(args.width, args.height))
+    boards = to_array(grids)
+
+    start = time.perf_counter()
+    batched = count_moves(boards)
+    batched_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [len(find_moves(grid, args.width, args.height,
+                               build_type_index(grid, args.width, args.height)))
+                for grid in grids]
+    loop_time = time.perf_counter() - start
+
+    mismatches = int(np.count_nonzero(batched != np.array(expected)))
+    print(f"batched:  {len(grids) / batched_time:10.0f} boards/s")
+    print(f"per pair: {len(grids) / loop_time:10.0f} boards/s")
+    print(f"mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    main()
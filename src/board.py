@@ -1,21 +1,39 @@
 import random
-from collections import deque
 
 import pygame
 
-from particle import Firework
+from analysis_worker import ANALYZE, SOLVE, AnalysisWorker, BoardSnapshot
+from board_state import BoardState
+from connectivity import can_link
+from moves import build_type_index, iter_candidate_pairs
+from particle import FireworkShow
+from shuffle import CANDIDATE_TIME_LIMIT, shuffle_types
 from tile import Tile
-from font_utils import get_chinese_font
+from font_utils import render_text
+from surface_pool import get_overlay
 
 class Board:
     def __init__(self, width=14, height=7, tile_width=60, tile_height=80,
-                 offset_x=0, offset_y=0):
+                 offset_x=0, offset_y=0, seed=None, solvable_shuffle=True, layout=None,
+                 background_color=(40, 40, 40), time_limits=True):
         self.width = width
         self.height = height
         self.tile_width = tile_width
         self.tile_height = tile_height
         self.offset_x = offset_x
         self.offset_y = offset_y
+        # Seeded boards replay the same sequence of layouts
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Only accept shuffles that can still be cleared completely
+        self.solvable_shuffle = solvable_shuffle
+        # Without time limits, searches stop on node budgets only, so a
+        # seeded board plays out the same way on any machine
+        self.time_limits = time_limits
+        # Type grid to start from instead of a generated board, such as an
+        # entry of a board pack; only used for the first game
+        self.layout = layout
+        self.background_color = background_color
         self.tiles = []
         self.selected_tiles = []
         self.animation_path = []
@@ -27,7 +45,7 @@ class Board:
         
         
         self.game_completed = False
-        self.fireworks = []
+        self.fireworks = FireworkShow()
         self.firework_timer = 0
         self.play_again_button = pygame.Rect(0, 0, 200, 60)
         self.update_play_again_button_position()
@@ -38,207 +56,229 @@ class Board:
         self.hint_timer = 0
         self.hint_tiles = []
         
+        # Solve button and auto-solve state
+        self.solve_button = pygame.Rect(0, 0, 100, 40)
+        self.update_solve_button_position()
+        self.auto_solving = False
+        self.solution = []
+        
+        # Game rules live in a headless BoardState; self.tiles is its view
+        self.state = None
+        
+        # Searches run on a background thread. Every change to the tiles
+        # bumps the state's revision so answers for an older board are dropped.
+        self.analysis_worker = AnalysisWorker(seed)
+        self.analysis_pending = False
+        self.pending_freed = []
+        self.hint_requested = False
+        self.solve_pending = False
+        
+        # The tiles and the empty ring around them are drawn into a cached
+        # layer. Changed cells are repainted into it and queued in
+        # dirty_rects, so a frame only presents what changed.
+        self.board_layer = None
+        self.layer_valid = False
+        self.dirty_rects = []
+        self.button_state = None
+        
         self.initialize_board()
         
     def initialize_board(self):
-        self.tiles = self.generate_solvable_board()
-        
-    def generate_solvable_board(self):
-        # Generate a board and ensure at least one pair can connect
-        max_attempts = 10
+        if self.layout is not None:
+            self.load_layout(self.layout)
+            self.layout = None
+        else:
+            self.set_state(self.generate_solvable_board())
         
-        for attempt in range(max_attempts):
-            tiles = self.generate_board()
-            if self.has_valid_move(tiles):
-                return tiles
+    def load_layout(self, grid):
+        # Start over from a grid of tile types, such as a board pack entry
+        if len(grid) != self.height or any(len(row) != self.width for row in grid):
+            raise ValueError(f"Layout is not {self.width}x{self.height}")
+        self.selected_tiles = []
+        self.hint_tiles = []
+        self.hint_timer = 0
+        self.set_state(BoardState(self.width, self.height, [list(row) for row in grid]))
+        
+    def set_state(self, state):
+        # Show a new BoardState and forget any search for the previous one
+        self.state = state
+        self.tiles = self.build_tiles(state.grid)
+        self.invalidate_layer()
+        self.drop_analysis()
+        
+    @property
+    def type_positions(self):
+        return self.state.type_positions
+    
+    @property
+    def live_moves(self):
+        return self.state.live_moves
+    
+    @property
+    def revision(self):
+        return self.state.revision
+        
+    def refresh_moves(self):
+        # Full rebuild of the type index and the live-move set
+        self.state.refresh_moves()
+        self.drop_analysis()
+    
+    def drop_analysis(self):
+        # The revision changed, so a pending analysis and a hint waiting
+        # for it belong to a board that is gone
+        self.analysis_pending = False
+        self.pending_freed = []
+        self.hint_requested = False
+    
+    @property
+    def moves_remaining(self):
+        return len(self.live_moves)
         
-        # If no valid board found, use last generated board
-        # (very unlikely with many tiles)
-        return tiles
+    def generate_solvable_board(self):
+        # Build the layout together with a full solution, so the board can
+        # always be cleared
+        return BoardState.generate(self.width, self.height, rng=self.rng)
         
     def generate_board(self):
         # We have 34 SVG files (0-33)
         # We need 98 tiles total (14×7)
-        # Each type must appear an even number of times
-        tile_types = []
-        
         # Distribution: 15 types × 4 tiles + 19 types × 2 tiles = 98 tiles
-        # Types 0-14: 4 tiles each (60 tiles)
-        for i in range(15):
-            tile_types.extend([i, i, i, i])
-        
-        # Types 15-33: 2 tiles each (38 tiles)
-        for i in range(15, 34):
-            tile_types.extend([i, i])
-        
-        # Shuffle the tiles
-        random.shuffle(tile_types)
-        
-        # Create the board
+        # Shuffled randomly, with no guarantee that any pair can connect
+        return BoardState.generate_random(self.width, self.height, self.rng)
+    
+    def build_tiles(self, grid):
+        # Create the board from a grid of tile types (None for empty cells)
         tiles = []
         for y in range(self.height):
             row = []
             for x in range(self.width):
-                if tile_types:  # Check if we still have tiles to place
-                    tile_type = tile_types.pop()
+                tile_type = grid[y][x]
+                if tile_type is not None:
                     tile = Tile(x, y, tile_type, self.tile_width, self.tile_height,
                                self.offset_x, self.offset_y)
                     row.append(tile)
                 else:
-                    row.append(None)  # Empty cell if we run out of tiles
+                    row.append(None)
             tiles.append(row)
         
         return tiles
     
     def show_hint(self):
         # Find a valid pair that can connect
-        import random
-        
         # Clear any existing selections
         for tile in self.selected_tiles:
-            tile.selected = False
+            self.set_selected(tile, False)
         self.selected_tiles.clear()
         
-        # Collect all possible pairs
-        possible_pairs = []
+        if not self.live_moves and self.analysis_pending:
+            # Show the hint as soon as the background analysis answers
+            self.hint_requested = True
+            return
         
-        for y1 in range(self.height):
-            for x1 in range(self.width):
-                tile1 = self.tiles[y1][x1]
-                if not tile1 or not tile1.visible:
-                    continue
-                
-                for y2 in range(self.height):
-                    for x2 in range(self.width):
-                        if (x1, y1) == (x2, y2):
-                            continue
-                        tile2 = self.tiles[y2][x2]
-                        if not tile2 or not tile2.visible:
-                            continue
-                        
-                        if tile1.match(tile2):
-                            path = self.can_connect(tile1, tile2)
-                            if path:
-                                possible_pairs.append((tile1, tile2))
-        
-        if possible_pairs:
+        if self.live_moves:
             # Select a random pair
-            tile1, tile2 = random.choice(possible_pairs)
-            tile1.selected = True
-            tile2.selected = True
+            (x1, y1), (x2, y2) = random.choice(tuple(self.live_moves))
+            tile1, tile2 = self.tiles[y1][x1], self.tiles[y2][x2]
+            self.set_selected(tile1, True)
+            self.set_selected(tile2, True)
             self.hint_tiles = [tile1, tile2]
             self.hint_timer = 60  # Show for 1 second at 60 FPS
     
     def shuffle_board(self):
-        # Collect all visible tiles and their types
-        visible_tiles = []
-        tile_types = []
-        
-        for row in self.tiles:
-            for tile in row:
-                if tile and tile.visible:
-                    visible_tiles.append(tile)
-                    tile_types.append(tile.tile_type)
-        
-        if len(visible_tiles) < 2:
-            return  # Not enough tiles to shuffle
-        
-        # Try shuffling until we get a board with at least one valid move
-        max_shuffle_attempts = 50
-        original_types = tile_types.copy()
-        
-        for attempt in range(max_shuffle_attempts):
-            # Shuffle the tile types
-            random.shuffle(tile_types)
-            
-            # Assign shuffled types back to tiles
-            for i, tile in enumerate(visible_tiles):
-                tile.tile_type = tile_types[i]
-                tile.load_image()
-            
-            # Check if this configuration has at least one valid move
-            if self.has_any_valid_move():
-                print(f"Board shuffled successfully after {attempt + 1} attempts")
-                return
+        # Search a new arrangement on the type grid; tiles are only touched
+        # once a layout with at least one valid move has been chosen
+        time_limit = CANDIDATE_TIME_LIMIT if self.time_limits else None
+        tile_types, live_moves, attempts = shuffle_types(
+            self.state.grid, self.width, self.height, self.rng,
+            ensure_solvable=self.solvable_shuffle, time_limit=time_limit)
+        
+        if tile_types is None:
+            # Not enough tiles, or no valid configuration found after many
+            # attempts (this is very unlikely); keep the current layout
+            print("Warning: Could not find valid shuffle configuration")
+            return
         
-        # If no valid configuration found after many attempts,
-        # restore original (this is very unlikely)
-        print("Warning: Could not find valid shuffle configuration")
-        for i, tile in enumerate(visible_tiles):
-            tile.tile_type = original_types[i]
+        print(f"Board shuffled successfully after {attempts} attempts")
+        self.apply_shuffled_types(tile_types, live_moves)
+    
+    def apply_shuffled_types(self, tile_types, live_moves):
+        self.state.set_types(tile_types, live_moves)
+        self.drop_analysis()
+        # Assign shuffled types back to the visible tiles in row-major order
+        visible_tiles = [tile for row in self.tiles for tile in row if tile and tile.visible]
+        for tile, tile_type in zip(visible_tiles, tile_types):
+            tile.tile_type = tile_type
             tile.load_image()
+        self.invalidate_layer()
     
     def can_connect_test(self, x1, y1, x2, y2, visible_grid):
-        if (x1, y1) == (x2, y2):
+        return can_link(visible_grid, self.width, self.height, x1, y1, x2, y2)
+    
+    def has_valid_move(self, test_tiles):
+        # Check if there's at least one valid move. test_tiles may be a
+        # BoardState (as returned by the generate_* methods), a grid of
+        # Tile objects or a grid of tile types; None checks the current board.
+        if isinstance(test_tiles, BoardState):
+            return bool(test_tiles.live_moves)
+        if test_tiles:
+            type_positions = build_type_index(
+                test_tiles, self.width, self.height,
+                lambda cell: cell.tile_type if isinstance(cell, Tile) else cell)
+            # can_link treats only None and False as empty, so type 0 blocks
+            for (x1, y1), (x2, y2) in iter_candidate_pairs(type_positions):
+                if self.can_connect_test(x1, y1, x2, y2, test_tiles):
+                    return True
             return False
         
-        from collections import deque
-        queue = deque([((x1, y1), -1, -1)])
-        visited = set()
-        
-        while queue:
-            (x, y), prev_dir, turns = queue.popleft()
-            
-            if (x, y) == (x2, y2):
-                return True
-            
-            if turns > 1:
-                continue
-            
-            state = (x, y, prev_dir, turns)
-            if state in visited:
+        # For current board state
+        return bool(self.live_moves)
+    
+    def request_analysis(self, freed):
+        # The state already dropped moves that used the removed tiles, and
+        # the remaining ones stay valid. live_moves is otherwise complete
+        # for the board before pending_freed were removed, so the worker
+        # adds the moves the removals opened incrementally.
+        self.pending_freed.extend(freed)
+        self.analysis_pending = True
+        snapshot = BoardSnapshot(self.revision, self.width, self.height, self.get_type_grid(),
+                                 set(self.live_moves), list(self.pending_freed),
+                                 self.solvable_shuffle, self.time_limits)
+        self.analysis_worker.submit(ANALYZE, snapshot)
+    
+    def poll_analysis(self):
+        for result in self.analysis_worker.poll():
+            if result.revision != self.revision:
+                # The board changed since the snapshot was taken
+                if result.kind == SOLVE:
+                    self.solve_pending = False
+                elif not self.analysis_pending:
+                    self.hint_requested = False
                 continue
-            visited.add(state)
             
-            directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
-            
-            for i, (dx, dy) in enumerate(directions):
-                nx, ny = x + dx, y + dy
-                
-                if nx < -1 or nx > self.width or ny < -1 or ny > self.height:
-                    continue
-                
-                if (nx, ny) != (x2, y2):
-                    if 0 <= nx < self.width and 0 <= ny < self.height:
-                        if visible_grid[ny][nx]:
-                            continue
-                
-                new_turns = turns
-                if prev_dir != -1 and prev_dir != i:
-                    new_turns += 1
-                
-                if new_turns <= 1:
-                    queue.append(((nx, ny), i, new_turns))
-        
-        return False
+            if result.kind == ANALYZE:
+                self.apply_analysis(result)
+            elif result.kind == SOLVE:
+                self.apply_solution(result.solve_result)
     
-    def has_valid_move(self, test_tiles):
-        # Check if there's at least one valid move
-        for y1 in range(self.height):
-            for x1 in range(self.width):
-                tile1 = test_tiles[y1][x1] if test_tiles else self.tiles[y1][x1]
-                if not tile1 or not tile1.visible:
-                    continue
-                    
-                for y2 in range(self.height):
-                    for x2 in range(self.width):
-                        if (x1, y1) == (x2, y2):
-                            continue
-                        tile2 = test_tiles[y2][x2] if test_tiles else self.tiles[y2][x2]
-                        if not tile2 or not tile2.visible:
-                            continue
-                            
-                        if tile1.tile_type == tile2.tile_type:
-                            if test_tiles:
-                                # For initial board generation
-                                visible_grid = [[True if t else False for t in row] for row in test_tiles]
-                                if self.can_connect_test(x1, y1, x2, y2, visible_grid):
-                                    return True
-                            else:
-                                # For current board state
-                                if self.can_connect(tile1, tile2):
-                                    return True
-        return False
+    def apply_analysis(self, result):
+        # A hint clicked while this analysis ran is shown on its outcome,
+        # including a board the worker had to shuffle
+        hint_requested = self.hint_requested
+        if result.live_moves is None:
+            # The analysis failed, fall back to a full rebuild
+            self.refresh_moves()
+        elif result.shuffled_types:
+            # The board was dead; take the worker's shuffle
+            self.apply_shuffled_types(result.shuffled_types, result.live_moves)
+            print("Board shuffled in the background")
+        else:
+            self.state.live_moves = result.live_moves
+            self.analysis_pending = False
+            self.pending_freed = []
+        
+        self.hint_requested = False
+        if hint_requested:
+            self.show_hint()
     
     def has_any_valid_move(self):
         # Check current board for any valid moves
@@ -253,8 +293,10 @@ class Board:
                 if tile:
                     tile.rect.x = tile.x * self.tile_width + self.offset_x
                     tile.rect.y = tile.y * self.tile_height + self.offset_y
+        self.invalidate_layer()
         self.update_play_again_button_position()
         self.update_hint_button_position()
+        self.update_solve_button_position()
     
     def update_size_and_position(self, new_tile_width, new_tile_height, new_offset_x, new_offset_y):
         self.tile_width = new_tile_width
@@ -270,8 +312,10 @@ class Board:
                     tile.rect.x = tile.x * self.tile_width + self.offset_x
                     tile.rect.y = tile.y * self.tile_height + self.offset_y
         
+        self.invalidate_layer()
         self.update_play_again_button_position()
         self.update_hint_button_position()
+        self.update_solve_button_position()
     
             
     def update_play_again_button_position(self):
@@ -297,13 +341,25 @@ class Board:
             self.hint_button.height = button_height
             self.hint_button.x = 20
             self.hint_button.y = info.get_height() - self.hint_button.height - 20
+    
+    def update_solve_button_position(self):
+        # Position button right of the hint button with the same scaled size
+        info = pygame.display.get_surface()
+        if info:
+            scale_factor = min(info.get_width() / 1600, info.get_height() / 1000)
+            button_width = int(100 * scale_factor)
+            button_height = int(40 * scale_factor)
+            self.solve_button.width = button_width
+            self.solve_button.height = button_height
+            self.solve_button.x = 20 + button_width + 10
+            self.solve_button.y = info.get_height() - self.solve_button.height - 20
             
     def update(self):
         if self.failed_match_timer > 0:
             self.failed_match_timer -= 1
             if self.failed_match_timer == 0:
                 for tile in self.failed_match_tiles:
-                    tile.selected = False
+                    self.set_selected(tile, False)
                 self.selected_tiles.clear()
                 self.failed_match_tiles = []
         
@@ -313,17 +369,18 @@ class Board:
             if self.hint_timer == 0:
                 # Clear hint selection
                 for tile in self.hint_tiles:
-                    tile.selected = False
+                    self.set_selected(tile, False)
                 self.hint_tiles = []
                 
-        # [自動解題更新邏輯] - 如需啟用，請取消以下註解
+        # Play the next pair of the solution once the previous one is gone
+        if self.auto_solving and not self.animating:
+            self.play_next_solution_move()
+            
+        self.poll_analysis()
                 
         if self.game_completed:
             # Update fireworks
-            for firework in self.fireworks[:]:
-                firework.update()
-                if not firework.is_alive():
-                    self.fireworks.remove(firework)
+            self.fireworks.update()
                     
             # Add new fireworks periodically
             self.firework_timer += 1
@@ -333,38 +390,89 @@ class Board:
                 if info:
                     x = random.randint(100, info.get_width() - 100)
                     y = info.get_height() - 50
-                    self.fireworks.append(Firework(x, y))
+                    self.fireworks.launch(x, y)
     
-    def draw(self, screen):
+    def is_idle(self):
+        # Nothing animates, counts down or waits for the background worker,
+        # and nothing is queued for drawing, so frames would not change
+        return not (self.animating or self.failed_match_timer or self.hint_timer
+                    or self.auto_solving or self.analysis_pending or self.solve_pending
+                    or self.game_completed or self.dirty_rects or not self.layer_valid)
+    
+    def layer_origin(self):
+        # Screen position of the layer's top-left corner, one tile outside
+        # the board so link lines through the border ring are covered
+        return (self.offset_x - self.tile_width, self.offset_y - self.tile_height)
+    
+    def layer_rect(self):
+        return pygame.Rect(self.layer_origin(), ((self.width + 2) * self.tile_width,
+                                                 (self.height + 2) * self.tile_height))
+    
+    def invalidate_layer(self):
+        # Rebuild the whole layer on the next draw
+        self.layer_valid = False
+        
+    def build_layer(self):
+        size = self.layer_rect().size
+        if self.board_layer is None or self.board_layer.get_size() != size:
+            self.board_layer = pygame.Surface(size)
+            if pygame.display.get_surface():
+                self.board_layer = self.board_layer.convert()
+        self.board_layer.fill(self.background_color)
+        origin = self.layer_origin()
         for row in self.tiles:
             for tile in row:
                 if tile:
-                    tile.draw(screen)
+                    tile.draw(self.board_layer, origin)
+        self.layer_valid = True
+        self.dirty_rects = []
+        
+    def repaint_tile(self, tile):
+        # Redraw one cell of the layer and queue it for presenting
+        if not self.layer_valid:
+            return
+        origin_x, origin_y = self.layer_origin()
+        self.board_layer.fill(self.background_color, tile.rect.move(-origin_x, -origin_y))
+        tile.draw(self.board_layer, (origin_x, origin_y))
+        self.dirty_rects.append(tile.rect.copy())
+        
+    def set_selected(self, tile, selected):
+        if tile.selected != selected:
+            tile.selected = selected
+            self.repaint_tile(tile)
+    
+    def animation_rect(self):
+        # Area covered by the link line, including its width
+        points = [self.get_pixel_position(pos) for pos in self.animation_path]
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        return pygame.Rect(min(xs) - 4, min(ys) - 4, max(xs) - min(xs) + 9, max(ys) - min(ys) + 9)
+    
+    def get_button_state(self, screen):
+        hint_enabled = not self.animating and self.hint_timer == 0 and not self.auto_solving
+        solve_enabled = not self.animating and not self.auto_solving and not self.solve_pending
+        return (hint_enabled, solve_enabled, screen.get_size())
+        
+    def draw(self, screen):
+        # Full redraw
+        if not self.layer_valid:
+            self.build_layer()
+        screen.blit(self.board_layer, self.layer_origin())
+        self.dirty_rects = []
                     
         if self.animating and self.animation_path:
             self.draw_animation(screen)
             
-        # [自動解題按鈕] - 如需啟用，請取消以下註解
-        # Draw solve button only if game is not completed
-        # if not self.game_completed:
-        #     pygame.draw.rect(screen, (100, 100, 100), self.solve_button)
-        #     pygame.draw.rect(screen, (200, 200, 200), self.solve_button, 2)
-        #     font = pygame.font.Font(None, 24)
-        #     text = font.render("SOLVE", True, (255, 255, 255))
-        #     text_rect = text.get_rect(center=self.solve_button.center)
-        #     screen.blit(text, text_rect)
+        if not self.game_completed:
+            self.draw_buttons(screen)
             
         # Draw celebration if game is completed
         if self.game_completed:
             # Draw fireworks
-            for firework in self.fireworks:
-                firework.draw(screen)
+            self.fireworks.draw(screen)
                 
             # Draw semi-transparent overlay
-            overlay = pygame.Surface((screen.get_width(), screen.get_height()))
-            overlay.set_alpha(100)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
+            screen.blit(get_overlay(screen.get_size(), (0, 0, 0), 100), (0, 0))
             
             # Draw congratulations text with shadow
             # Scale font size based on window size
@@ -373,17 +481,16 @@ class Board:
             scale_factor = min(screen_width / 1600, screen_height / 1000)  # Using initial dimensions
             congrats_font_size = int(96 * scale_factor)
             congrats_font_size = max(congrats_font_size, 48)  # Minimum font size
-            font_big = get_chinese_font(congrats_font_size)
                 
             # Draw shadow
-            text_shadow = font_big.render("恭喜!!", True, (50, 30, 0))
+            text_shadow = render_text("恭喜!!", congrats_font_size, (50, 30, 0))
             shadow_rect = text_shadow.get_rect(
                 center=(screen.get_width() // 2 + 3, screen.get_height() // 2 - 50 + 3)
             )
             screen.blit(text_shadow, shadow_rect)
             
             # Draw main text
-            text_congrats = font_big.render("恭喜!!", True, (255, 215, 0))
+            text_congrats = render_text("恭喜!!", congrats_font_size, (255, 215, 0))
             text_rect = text_congrats.get_rect(
                 center=(screen.get_width() // 2, screen.get_height() // 2 - 50)
             )
@@ -395,34 +502,70 @@ class Board:
             # Scale button font
             button_font_size = int(36 * scale_factor)
             button_font_size = max(button_font_size, 20)  # Minimum font size
-            font_button = get_chinese_font(button_font_size)
                 
-            text_play_again = font_button.render("再來一局", True, (255, 255, 255))
+            text_play_again = render_text("再來一局", button_font_size, (255, 255, 255))
             text_rect = text_play_again.get_rect(center=self.play_again_button.center)
             screen.blit(text_play_again, text_rect)
+    
+    def draw_dirty(self, screen):
+        """
+        Draw only what changed since the last frame during play; returns
+        the screen rectangles to present with pygame.display.update.
+        """
+        if not self.layer_valid:
+            self.build_layer()
+            screen.blit(self.board_layer, self.layer_origin())
+            rects = [self.layer_rect()]
+        else:
+            # Restore the changed areas from the layer
+            origin_x, origin_y = self.layer_origin()
+            rects = self.dirty_rects
+            for rect in rects:
+                screen.blit(self.board_layer, rect, rect.move(-origin_x, -origin_y))
+        self.dirty_rects = []
         
-        # Draw hint button (only during gameplay)
-        if not self.game_completed:
-            # Scale button appearance
-            scale_factor = min(screen.get_width() / 1600, screen.get_height() / 1000)
-            
-            # Draw button
-            # Gray out button during animation or hint display
-            button_enabled = not self.animating and self.hint_timer == 0
-            button_color = (0, 80, 150) if button_enabled else (100, 100, 100)
-            border_color = (0, 150, 255) if button_enabled else (150, 150, 150)
-            pygame.draw.rect(screen, button_color, self.hint_button)
-            pygame.draw.rect(screen, border_color, self.hint_button, 2)
+        if self.animating and self.animation_path:
+            # The line stays on screen until finish_animation queues its area
+            rects.append(self.animation_rect())
+            self.draw_animation(screen)
             
-            # Draw text
-            hint_font_size = int(24 * scale_factor)
-            hint_font_size = max(hint_font_size, 16)  # Minimum font size
-            font_hint = pygame.font.Font(None, hint_font_size)
-            text_color = (255, 255, 255) if button_enabled else (200, 200, 200)
-            text_hint = font_hint.render("提示", True, text_color)
-            text_rect = text_hint.get_rect(center=self.hint_button.center)
-            screen.blit(text_hint, text_rect)
-        
+        button_state = self.get_button_state(screen)
+        buttons = [self.hint_button, self.solve_button]
+        if button_state != self.button_state or any(
+                button.collidelist(rects) != -1 for button in buttons):
+            self.draw_buttons(screen)
+            rects.extend(button.copy() for button in buttons)
+        
+        screen_rect = screen.get_rect()
+        return [rect.clip(screen_rect) for rect in rects]
+    
+    def draw_buttons(self, screen):
+        hint_enabled, solve_enabled, _ = self.button_state = self.get_button_state(screen)
+        scale_factor = min(screen.get_width() / 1600, screen.get_height() / 1000)
+        
+        # Draw solve button
+        button_color = (100, 100, 100) if solve_enabled else (70, 70, 70)
+        pygame.draw.rect(screen, button_color, self.solve_button)
+        pygame.draw.rect(screen, (200, 200, 200), self.solve_button, 2)
+        solve_font_size = max(int(24 * scale_factor), 16)  # Minimum font size
+        text = render_text("SOLVE", solve_font_size, (255, 255, 255), chinese=False)
+        text_rect = text.get_rect(center=self.solve_button.center)
+        screen.blit(text, text_rect)
+        
+        # Draw hint button
+        # Gray out button during animation or hint display
+        button_color = (0, 80, 150) if hint_enabled else (100, 100, 100)
+        border_color = (0, 150, 255) if hint_enabled else (150, 150, 150)
+        pygame.draw.rect(screen, button_color, self.hint_button)
+        pygame.draw.rect(screen, border_color, self.hint_button, 2)
+        
+        # Draw text
+        hint_font_size = int(24 * scale_factor)
+        hint_font_size = max(hint_font_size, 16)  # Minimum font size
+        text_color = (255, 255, 255) if hint_enabled else (200, 200, 200)
+        text_hint = render_text("提示", hint_font_size, text_color, chinese=False)
+        text_rect = text_hint.get_rect(center=self.hint_button.center)
+        screen.blit(text_hint, text_rect)
             
     def draw_animation(self, screen):
         if len(self.animation_path) < 2:
@@ -439,10 +582,9 @@ class Board:
         # Wait for 0.5 seconds
         wait_frames = 30
         if self.animation_progress >= wait_frames:
+            # Valid moves after removing tiles (and a shuffle if there are
+            # none left) are worked out in the background
             self.finish_animation()
-            # Check if there are still valid moves after removing tiles
-            if not self.has_any_valid_move():
-                self.shuffle_board()
             
     def get_pixel_position(self, grid_pos):
         x, y = grid_pos
@@ -455,6 +597,12 @@ class Board:
             tile.visible = False
             tile.selected = False
             self.tiles[tile.y][tile.x] = None
+            self.repaint_tile(tile)
+        if self.animation_path:
+            # Wipe the link line off the screen
+            self.dirty_rects.append(self.animation_rect())
+        tile1, tile2 = self.tiles_to_remove
+        freed = self.state.remove_pair((tile1.x, tile1.y), (tile2.x, tile2.y))
             
         self.selected_tiles.clear()
         self.animation_path = []
@@ -465,9 +613,11 @@ class Board:
         # Check if game is complete
         if self.is_game_complete():
             self.game_completed = True
+        else:
+            self.request_analysis(freed)
                     
     def handle_click(self, pos):
-        if self.animating or self.failed_match_timer > 0:
+        if self.animating or self.failed_match_timer > 0 or self.auto_solving or self.solve_pending:
             return
             
         # Check if game is completed and play again button was clicked
@@ -482,6 +632,10 @@ class Board:
                 self.show_hint()
                 return
             
+            if self.solve_button.collidepoint(pos):
+                self.start_auto_solve()
+                return
+            
             
         clicked_tile = None
         for row in self.tiles:
@@ -498,15 +652,15 @@ class Board:
     def handle_tile_selection(self, tile):
         if tile in self.selected_tiles:
             self.selected_tiles.remove(tile)
-            tile.selected = False
+            self.set_selected(tile, False)
         else:
             if len(self.selected_tiles) >= 2:
                 for selected in self.selected_tiles:
-                    selected.selected = False
+                    self.set_selected(selected, False)
                 self.selected_tiles.clear()
                 
             self.selected_tiles.append(tile)
-            tile.selected = True
+            self.set_selected(tile, True)
             
             if len(self.selected_tiles) == 2:
                 self.check_match()
@@ -529,62 +683,55 @@ class Board:
         if tile1 == tile2:
             return None
             
-        pos1 = (tile1.x, tile1.y)
-        pos2 = (tile2.x, tile2.y)
+        return self.state.find_path((tile1.x, tile1.y), (tile2.x, tile2.y))
         
-        queue = deque([(pos1, -1, -1, [pos1])])
-        visited = set()
+    def is_game_complete(self):
+        return self.state.is_cleared()
+    
+    def get_type_grid(self):
+        return self.state.copy_grid()
+    
+    def start_auto_solve(self):
+        # Clear any existing selections
+        for tile in self.selected_tiles:
+            self.set_selected(tile, False)
+        self.selected_tiles.clear()
         
-        while queue:
-            (x, y), prev_dir, turns, path = queue.popleft()
-            
-            if (x, y) == pos2:
-                return path
-                
-            if turns > 1:
-                continue
-                
-            state = (x, y, prev_dir, turns)
-            if state in visited:
-                continue
-            visited.add(state)
-            
-            directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+        self.solve_pending = True
+        snapshot = BoardSnapshot(self.revision, self.width, self.height, self.get_type_grid(),
+                                 time_limits=self.time_limits)
+        self.analysis_worker.submit(SOLVE, snapshot)
+        
+    def apply_solution(self, result):
+        self.solve_pending = False
+        if result is None:
+            return
+        print(f"Auto-solve {result.summary()}")
+        if result.solved:
+            self.solution = result.solution
+            self.auto_solving = True
             
-            for i, (dx, dy) in enumerate(directions):
-                nx, ny = x + dx, y + dy
-                
-                if nx < -1 or nx > self.width or ny < -1 or ny > self.height:
-                    continue
-                    
-                if (nx, ny) != pos2:
-                    if 0 <= nx < self.width and 0 <= ny < self.height:
-                        if self.tiles[ny][nx] and self.tiles[ny][nx].visible:
-                            continue
-                
-                new_turns = turns
-                if prev_dir != -1 and prev_dir != i:
-                    new_turns += 1
-                    
-                if new_turns <= 1:
-                    new_path = path + [(nx, ny)]
-                    queue.append(((nx, ny), i, new_turns, new_path))
-                    
-        return None
+    def play_next_solution_move(self):
+        if not self.solution:
+            self.auto_solving = False
+            return
         
-    def is_game_complete(self):
-        for row in self.tiles:
-            for tile in row:
-                if tile and tile.visible:
-                    return False
-        return True
-    
-    # [自動解題功能] - 如需啟用，請取消以下所有註解
-    # 步驟1: 取消 __init__ 中的自動解題相關變數註解
-    # 步驟2: 取消 update() 中的自動解題更新邏輯註解
-    # 步驟3: 取消 draw() 中的 SOLVE 按鈕繪製註解
-    # 步驟4: 取消 handle_click() 中的 SOLVE 按鈕點擊處理註解
-    # 步驟5: 取消以下兩個方法的註解
+        (x1, y1), (x2, y2) = self.solution.pop(0)
+        tile1, tile2 = self.tiles[y1][x1], self.tiles[y2][x2]
+        path = self.can_connect(tile1, tile2) if tile1 and tile2 else None
+        if not path:
+            # The board no longer matches the solution
+            self.auto_solving = False
+            self.solution = []
+            return
+        
+        self.set_selected(tile1, True)
+        self.set_selected(tile2, True)
+        self.selected_tiles = [tile1, tile2]
+        self.animation_path = path
+        self.animation_progress = 0
+        self.animating = True
+        self.tiles_to_remove = [tile1, tile2]
         
     def restart_game(self):
         # Reset all game state
@@ -597,9 +744,13 @@ class Board:
         self.tiles_to_remove = []
         self.failed_match_timer = 0
         self.failed_match_tiles = []
-        self.fireworks = []
+        self.fireworks.clear()
         self.firework_timer = 0
         self.hint_timer = 0
         self.hint_tiles = []
+        self.auto_solving = False
+        self.solution = []
+        self.hint_requested = False
+        self.solve_pending = False
         # Initialize a new board
         self.initialize_board()
\ No newline at end of file
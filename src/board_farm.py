@@ -0,0 +1,128 @@
+"""
+Seeded board generation and verification spread over a process pool.
+
+Every board is generated from its own seed, so the output for a seed range
+is the same whatever the number of workers. iter_boards yields boards
+lazily, in seed order or as workers finish them; the command line writes
+them to a file in seed order unless --unordered is given.
+
+    python src/board_farm.py --start-seed 0 --count 10000 --output boards.jsonl
+    python src/board_farm.py --count 10000 --format pack --output boards.mjpk
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+from board_pack import write_pack
+from generator import generate_layout
+from solver import certify
+
+class FarmBoard:
+    def __init__(self, seed, width, height, grid, verified, worker, elapsed):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.grid = grid
+        self.verified = verified  # Proven clearable by the solver (or not checked)
+        self.worker = worker  # Process id of the worker that built it
+        self.elapsed = elapsed  # Seconds spent generating and verifying
+
+    def to_json(self):
+        return json.dumps({"seed": self.seed, "width": self.width,
+                           "height": self.height, "grid": self.grid})
+
+class FarmStats:
+    """Boards and busy time per worker process"""
+    def __init__(self):
+        self.workers = {}
+        self.start = time.perf_counter()
+
+    def add(self, board):
+        count, busy = self.workers.get(board.worker, (0, 0.0))
+        self.workers[board.worker] = (count + 1, busy + board.elapsed)
+
+    def report(self):
+        lines = []
+        total = 0
+        for worker, (count, busy) in sorted(self.workers.items()):
+            total += count
+            rate = count / busy if busy > 0 else 0.0
+            lines.append(f"worker {worker}: {count} boards, {rate:.1f} boards/s")
+        wall = time.perf_counter() - self.start
+        lines.append(f"total: {total} boards in {wall:.2f}s, {total / wall:.1f} boards/s")
+        return "\n".join(lines)
+
+def build_board(task):
+    # Runs in a worker process
+    seed, width, height, verify = task
+    start = time.perf_counter()
+    grid, _ = generate_layout(width, height, seed=seed)
+    verified = certify(grid, width, height) if verify else True
+    return FarmBoard(seed, width, height, grid, verified, os.getpid(),
+                     time.perf_counter() - start)
+
+def iter_boards(seeds, width=14, height=7, workers=None, verify=True, chunksize=4,
+                ordered=True):
+    """
+    Yield a FarmBoard for every seed, in the order of seeds, or in
+    completion order when ordered is False. Unordered output avoids
+    holding back finished boards behind a slow one.
+    """
+    tasks = ((seed, width, height, verify) for seed in seeds)
+    with multiprocessing.Pool(workers) as pool:
+        if ordered:
+            yield from pool.imap(build_board, tasks, chunksize)
+        else:
+            yield from pool.imap_unordered(build_board, tasks, chunksize)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate verified boards for a seed range")
+    parser.add_argument("--start-seed", type=int, default=0)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=14)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--no-verify", action="store_true",
+                        help="skip proving each board with the solver")
+    parser.add_argument("--format", choices=("jsonl", "pack"), default="jsonl",
+                        help="JSON lines, or a binary board pack (see board_pack.py)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="write boards as they finish instead of in seed order; "
+                             "entry k is then not necessarily seed start + k")
+    parser.add_argument("--output", default="boards.jsonl")
+    args = parser.parse_args()
+
+    seeds = range(args.start_seed, args.start_seed + args.count)
+    stats = FarmStats()
+    rejected = 0
+
+    def verified_boards():
+        nonlocal rejected
+        for board in iter_boards(seeds, args.width, args.height, args.workers,
+                                 not args.no_verify, ordered=not args.unordered):
+            stats.add(board)
+            if not board.verified:
+                rejected += 1
+                continue
+            yield board
+
+    if args.format == "pack":
+        write_pack(args.output, args.width, args.height,
+                   ((board.seed, board.grid) for board in verified_boards()))
+    else:
+        with open(args.output, "w") as output:
+            for board in verified_boards():
+                output.write(board.to_json() + "\n")
+
+    print(stats.report())
+    if rejected:
+        # Every entry stores its seed, so the gaps can still be found
+        print(f"{rejected} boards could not be verified and were skipped, "
+              f"so entries no longer line up with start seed + index")
+
+if __name__ == "__main__":
+    main()
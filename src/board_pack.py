@@ -0,0 +1,134 @@
+"""
+Compact binary board packs.
+
+A pack is a fixed 16-byte header followed by fixed-size records:
+
+    header:  magic "MJPK", version (u16), width (u16), height (u16),
+             reserved (u16), board count (u32)
+    record:  seed (u64), then one byte per cell in row-major order holding
+             the tile type, or 0xFF for an empty cell
+
+All integers are little-endian. Records all have the same size, so a pack
+opened with mmap loads board #k in O(1) without parsing the rest. Records
+are in the order they were written; board_farm.py writes them in seed
+order unless told otherwise, and every record carries its own seed.
+"""
+
+import mmap
+import os
+import struct
+
+MAGIC = b"MJPK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHHI")
+SEED = struct.Struct("<Q")
+MAX_SEED = 2 ** 64 - 1
+EMPTY_CELL = 0xFF
+
+class BoardPackError(Exception):
+    pass
+
+def encode_grid(grid):
+    return bytes(EMPTY_CELL if cell is None else cell for row in grid for cell in row)
+
+def decode_grid(data, width, height):
+    return [[None if cell == EMPTY_CELL else cell for cell in data[y * width:(y + 1) * width]]
+            for y in range(height)]
+
+def encode_record(seed, grid, width, height):
+    """Seed and cells of one board, checked against the pack's format"""
+    if not isinstance(seed, int) or not 0 <= seed <= MAX_SEED:
+        raise BoardPackError(f"Seed {seed!r} does not fit an unsigned 64-bit integer")
+    if len(grid) != height or any(len(row) != width for row in grid):
+        raise BoardPackError(f"Board {seed} is not {width}x{height}")
+    if any(cell is not None and not 0 <= cell < EMPTY_CELL for row in grid for cell in row):
+        raise BoardPackError(f"Board {seed} has a tile type outside 0-{EMPTY_CELL - 1}")
+    return SEED.pack(seed) + encode_grid(grid)
+
+def write_pack(path, width, height, entries):
+    """
+    Write (seed, grid) entries to a pack; returns the number of boards.
+    Each entry is checked before it is written. The pack is streamed to a
+    temporary file next to path and only moved into place once complete,
+    so an invalid entry, a failing producer or an interrupt never leaves a
+    half-written pack behind.
+    """
+    count = 0
+    temp_path = path + ".tmp"
+    try:
+        with open(temp_path, "wb") as pack:
+            pack.write(HEADER.pack(MAGIC, VERSION, width, height, 0, 0))
+            for seed, grid in entries:
+                pack.write(encode_record(seed, grid, width, height))
+                count += 1
+            # The count is only known once every entry has been streamed
+            pack.seek(0)
+            pack.write(HEADER.pack(MAGIC, VERSION, width, height, 0, count))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return count
+
+class BoardPack:
+    """Read-only, memory-mapped view of a pack file"""
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped
+            self.file.close()
+            raise BoardPackError(f"{path} is not a board pack")
+
+        if len(self.data) < HEADER.size:
+            self.close()
+            raise BoardPackError(f"{path} is not a board pack")
+        magic, version, self.width, self.height, _, self.count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise BoardPackError(f"{path} is not a version {VERSION} board pack")
+        self.record_size = SEED.size + self.width * self.height
+        expected_size = HEADER.size + self.count * self.record_size
+        if len(self.data) != expected_size:
+            problem = "truncated" if len(self.data) < expected_size else "longer than its header says"
+            self.close()
+            raise BoardPackError(f"{path} is {problem}")
+
+    def __len__(self):
+        return self.count
+
+    def record_offset(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"Board {index} out of range for a pack of {self.count}")
+        return HEADER.size + index * self.record_size
+
+    def seed(self, index):
+        return SEED.unpack_from(self.data, self.record_offset(index))[0]
+
+    def __getitem__(self, index):
+        """(seed, grid) of board #index"""
+        offset = self.record_offset(index)
+        seed = SEED.unpack_from(self.data, offset)[0]
+        start = offset + SEED.size
+        cells = self.data[start:start + self.width * self.height]
+        return seed, decode_grid(cells, self.width, self.height)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def close(self):
+        if getattr(self, "data", None) is not None:
+            self.data.close()
+            self.data = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
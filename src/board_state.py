@@ -0,0 +1,124 @@
+"""
+Headless game rules for the link board.
+
+BoardState holds the board as a grid of tile type codes (None for an empty
+cell) together with the per-type position index and the set of currently
+connectable pairs. It covers generation, matching, connectivity, removal
+and shuffling, and imports nothing from pygame, so solvers, servers and
+benchmarks can create boards without a display. Board is the pygame view
+on top of it.
+"""
+
+import random
+
+from connectivity import find_path
+from generator import generate_layout, random_layout
+from moves import build_type_index, find_moves, update_moves
+from shuffle import shuffle_types
+
+class BoardState:
+    def __init__(self, width, height, grid):
+        self.width = width
+        self.height = height
+        self.grid = grid
+        # Tile type -> set of (x, y) positions still on the board
+        self.type_positions = {}
+        # Every currently connectable ((x1, y1), (x2, y2)) pair
+        self.live_moves = set()
+        # Bumped on every change to the grid
+        self.revision = 0
+        self.refresh_moves()
+
+    @classmethod
+    def generate(cls, width=14, height=7, seed=None, rng=None):
+        """New board that is guaranteed to be solvable"""
+        grid, _ = generate_layout(width, height, seed=seed, rng=rng)
+        return cls(width, height, grid)
+
+    @classmethod
+    def generate_random(cls, width=14, height=7, rng=random):
+        """New board with the standard tiles in random cells, unchecked"""
+        return cls(width, height, random_layout(width, height, rng))
+
+    def refresh_moves(self):
+        # Full rebuild of the type index and the live-move set, needed
+        # whenever tile types change position
+        self.type_positions = build_type_index(self.grid, self.width, self.height)
+        self.live_moves = set(find_moves(self.grid, self.width, self.height,
+                                         self.type_positions))
+        self.revision += 1
+
+    def copy_grid(self):
+        return [list(row) for row in self.grid]
+
+    def tile_count(self):
+        return sum(len(positions) for positions in self.type_positions.values())
+
+    def is_cleared(self):
+        return not self.type_positions
+
+    def find_path(self, pos1, pos2):
+        """Corner points of the shortest link between two cells, or None"""
+        return find_path(self.grid, self.width, self.height,
+                         pos1[0], pos1[1], pos2[0], pos2[1])
+
+    def can_match(self, pos1, pos2):
+        (x1, y1), (x2, y2) = pos1, pos2
+        tile_type = self.grid[y1][x1]
+        if tile_type is None or tile_type != self.grid[y2][x2]:
+            return False
+        return self.find_path(pos1, pos2) is not None
+
+    def remove_pair(self, pos1, pos2):
+        """
+        Take two tiles off the board. Moves that used them are dropped; the
+        remaining moves stay valid, but new moves the removal opened are
+        only added by update_moves.
+        """
+        freed = [pos1, pos2]
+        for x, y in freed:
+            tile_type = self.grid[y][x]
+            self.grid[y][x] = None
+            positions = self.type_positions.get(tile_type)
+            if positions:
+                positions.discard((x, y))
+                if not positions:
+                    del self.type_positions[tile_type]
+        self.live_moves.difference_update([move for move in self.live_moves
+                                           if move[0] in freed or move[1] in freed])
+        self.revision += 1
+        return freed
+
+    def update_moves(self, freed):
+        """Add the moves opened by removing the freed cells"""
+        update_moves(self.grid, self.width, self.height, self.type_positions,
+                     self.live_moves, freed)
+
+    def match(self, pos1, pos2):
+        """Remove a matching pair and update the live moves; False if illegal"""
+        if not self.can_match(pos1, pos2):
+            return False
+        self.update_moves(self.remove_pair(pos1, pos2))
+        return True
+
+    def set_types(self, tile_types, live_moves=None):
+        """Assign new types to the occupied cells in row-major order"""
+        types = iter(tile_types)
+        for row in self.grid:
+            for x, tile_type in enumerate(row):
+                if tile_type is not None:
+                    row[x] = next(types)
+        if live_moves is None:
+            self.refresh_moves()
+        else:
+            self.type_positions = build_type_index(self.grid, self.width, self.height)
+            self.live_moves = live_moves
+            self.revision += 1
+
+    def shuffle(self, rng=random, ensure_solvable=False):
+        """Shuffle the remaining tiles; returns the new types or None"""
+        tile_types, live_moves, _ = shuffle_types(self.grid, self.width, self.height,
+                                                  rng, ensure_solvable)
+        if tile_types is not None:
+            self.set_types(tile_types, live_moves)
+        return tile_types
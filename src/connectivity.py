@@ -0,0 +1,161 @@
+"""
+Line-of-sight connectivity for the link game.
+
+Two tiles connect when a path with at most two turns joins them through
+empty cells. The path may leave the board through the virtual border ring
+(x == -1, x == width, y == -1, y == height), which is always empty.
+
+A grid is any row-major sequence of rows where an empty cell holds None or
+False, so the same functions work on Board.tiles, on boolean visibility
+grids and on plain grids of tile type codes.
+"""
+
+def is_free(grid, width, height, x, y):
+    """Check whether a cell is empty or part of the border ring"""
+    if 0 <= x < width and 0 <= y < height:
+        cell = grid[y][x]
+        return cell is None or cell is False
+    return True
+
+def row_clear(grid, width, height, y, xa, xb):
+    """Check that every cell strictly between xa and xb on row y is empty"""
+    if y < 0 or y >= height:
+        return True
+    row = grid[y]
+    for x in range(max(min(xa, xb) + 1, 0), min(max(xa, xb), width)):
+        cell = row[x]
+        if cell is not None and cell is not False:
+            return False
+    return True
+
+def column_clear(grid, width, height, x, ya, yb):
+    """Check that every cell strictly between ya and yb on column x is empty"""
+    if x < 0 or x >= width:
+        return True
+    for y in range(max(min(ya, yb) + 1, 0), min(max(ya, yb), height)):
+        cell = grid[y][x]
+        if cell is not None and cell is not False:
+            return False
+    return True
+
+def row_reach(grid, width, height, x, y):
+    # Range of columns reachable from (x, y) by moving along its row
+    # through empty cells, including the border ring
+    if y < 0 or y >= height:
+        return -1, width
+    row = grid[y]
+    left = x
+    while left > 0:
+        cell = row[left - 1]
+        if cell is not None and cell is not False:
+            break
+        left -= 1
+    else:
+        left = -1
+    right = x
+    while right < width - 1:
+        cell = row[right + 1]
+        if cell is not None and cell is not False:
+            break
+        right += 1
+    else:
+        right = width
+    return left, right
+
+def column_reach(grid, width, height, x, y):
+    # Range of rows reachable from (x, y) by moving along its column
+    if x < 0 or x >= width:
+        return -1, height
+    top = y
+    while top > 0:
+        cell = grid[top - 1][x]
+        if cell is not None and cell is not False:
+            break
+        top -= 1
+    else:
+        top = -1
+    bottom = y
+    while bottom < height - 1:
+        cell = grid[bottom + 1][x]
+        if cell is not None and cell is not False:
+            break
+        bottom += 1
+    else:
+        bottom = height
+    return top, bottom
+
+def _direct_path(grid, width, height, x1, y1, x2, y2):
+    # Zero or one turn. Any such path is as short as the Manhattan distance.
+    if y1 == y2:
+        if row_clear(grid, width, height, y1, x1, x2):
+            return [(x1, y1), (x2, y2)]
+        return None
+    if x1 == x2:
+        if column_clear(grid, width, height, x1, y1, y2):
+            return [(x1, y1), (x2, y2)]
+        return None
+
+    for cx, cy in ((x2, y1), (x1, y2)):
+        if not is_free(grid, width, height, cx, cy):
+            continue
+        if cy == y1:
+            clear = (row_clear(grid, width, height, y1, x1, cx)
+                     and column_clear(grid, width, height, cx, y1, y2))
+        else:
+            clear = (column_clear(grid, width, height, x1, y1, cy)
+                     and row_clear(grid, width, height, y2, cx, x2))
+        if clear:
+            return [(x1, y1), (cx, cy), (x2, y2)]
+    return None
+
+def _two_turn_paths(grid, width, height, x1, y1, x2, y2):
+    # Yield (length, path) for every two-turn route. The middle segment
+    # runs along a column reachable from both tiles' rows, or along a row
+    # reachable from both tiles' columns.
+    if y1 != y2:
+        left1, right1 = row_reach(grid, width, height, x1, y1)
+        left2, right2 = row_reach(grid, width, height, x2, y2)
+        for cx in range(max(left1, left2), min(right1, right2) + 1):
+            if cx == x1 or cx == x2:
+                continue
+            if column_clear(grid, width, height, cx, y1, y2):
+                length = abs(cx - x1) + abs(y2 - y1) + abs(x2 - cx)
+                yield length, [(x1, y1), (cx, y1), (cx, y2), (x2, y2)]
+
+    if x1 != x2:
+        top1, bottom1 = column_reach(grid, width, height, x1, y1)
+        top2, bottom2 = column_reach(grid, width, height, x2, y2)
+        for cy in range(max(top1, top2), min(bottom1, bottom2) + 1):
+            if cy == y1 or cy == y2:
+                continue
+            if row_clear(grid, width, height, cy, x1, x2):
+                length = abs(cy - y1) + abs(x2 - x1) + abs(y2 - cy)
+                yield length, [(x1, y1), (x1, cy), (x2, cy), (x2, y2)]
+
+def find_path(grid, width, height, x1, y1, x2, y2):
+    """
+    Find the shortest path with at most two turns between two cells.
+    Returns the list of end and corner points, or None if they cannot link.
+    """
+    if (x1, y1) == (x2, y2):
+        return None
+
+    path = _direct_path(grid, width, height, x1, y1, x2, y2)
+    if path:
+        return path
+
+    best = None
+    for length, path in _two_turn_paths(grid, width, height, x1, y1, x2, y2):
+        if best is None or length < best[0]:
+            best = (length, path)
+    return best[1] if best else None
+
+def can_link(grid, width, height, x1, y1, x2, y2):
+    """Check whether two cells can be linked, stopping at the first path"""
+    if (x1, y1) == (x2, y2):
+        return False
+    if _direct_path(grid, width, height, x1, y1, x2, y2):
+        return True
+    for _ in _two_turn_paths(grid, width, height, x1, y1, x2, y2):
+        return True
+    return False
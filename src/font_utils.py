@@ -2,31 +2,74 @@ import os
 import sys
 import pygame
 
+from utils import LRUCache
+
+# Try different font paths for different systems
+CHINESE_FONT_PATHS = [
+    # Windows fonts
+    "C:/Windows/Fonts/mingliu.ttc",  # 細明體
+    "C:/Windows/Fonts/msjh.ttc",     # 微軟正黑體
+    "C:/Windows/Fonts/msyh.ttc",     # 微軟雅黑
+    "C:/Windows/Fonts/simsun.ttc",   # 宋體
+    # macOS fonts
+    "/System/Library/Fonts/STHeiti Medium.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    # Linux fonts
+    "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
+    "/usr/share/fonts/truetype/arphic/uming.ttc",
+]
+
+# Rendered labels; the UI only uses a handful of strings at a few sizes
+MAX_CACHED_TEXTS = 64
+
+_UNRESOLVED = object()
+_chinese_font_path = _UNRESOLVED  # None once resolved means the default font
+_fonts = {}  # (path, size) -> Font
+_texts = LRUCache(MAX_CACHED_TEXTS)
+
+def _load_font(path, size):
+    key = (path, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(path, size)
+    return font
+
 def get_chinese_font(size):
     """Get a font that supports Chinese characters"""
-    # Try different font paths for different systems
-    font_paths = [
-        # Windows fonts
-        "C:/Windows/Fonts/mingliu.ttc",  # 細明體
-        "C:/Windows/Fonts/msjh.ttc",     # 微軟正黑體
-        "C:/Windows/Fonts/msyh.ttc",     # 微軟雅黑
-        "C:/Windows/Fonts/simsun.ttc",   # 宋體
-        # macOS fonts
-        "/System/Library/Fonts/STHeiti Medium.ttc",
-        "/System/Library/Fonts/PingFang.ttc",
-        # Linux fonts
-        "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf",
-        "/usr/share/fonts/truetype/arphic/uming.ttc",
-    ]
-    
-    # Try to load each font
-    for font_path in font_paths:
-        if os.path.exists(font_path):
-            try:
-                return pygame.font.Font(font_path, size)
-            except:
-                continue
-    
-    # If no Chinese font found, return default font
+    global _chinese_font_path
+    if _chinese_font_path is _UNRESOLVED:
+        # Look for the font file only once
+        _chinese_font_path = None
+        for font_path in CHINESE_FONT_PATHS:
+            if os.path.exists(font_path):
+                try:
+                    font = _load_font(font_path, size)
+                except:
+                    continue
+                _chinese_font_path = font_path
+                return font
+
+    # If no Chinese font found, use the default font
     # This will show boxes for Chinese characters
-    return pygame.font.Font(None, size)
\ No newline at end of file
+    return _load_font(_chinese_font_path, size)
+
+def get_default_font(size):
+    """pygame's default font at the given size"""
+    return _load_font(None, size)
+
+def render_text(text, size, color, chinese=True):
+    """Antialiased text surface, rendered once per text, size, colour and font"""
+    key = (text, size, tuple(color), chinese)
+    surface = _texts.get(key)
+    if surface is None:
+        font = get_chinese_font(size) if chinese else get_default_font(size)
+        surface = font.render(text, True, color)
+        _texts.put(key, surface)
+    return surface
+
+def clear_font_cache():
+    # Fonts are invalid once pygame.font has been shut down
+    global _chinese_font_path
+    _chinese_font_path = _UNRESOLVED
+    _fonts.clear()
+    _texts.clear()
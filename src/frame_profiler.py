@@ -0,0 +1,143 @@
+"""
+Per-phase frame timing for the main loop.
+
+main() marks the end of each phase of a frame (event handling, updates,
+drawing, presenting, waiting for the next tick). While the profiler is on,
+an overlay in the top-left corner shows the rolling average, p95 and p99
+of every phase, and if a CSV path is given every frame is appended to it
+as one row of milliseconds.
+
+Turn it on with F3 in game, or from the start by setting MAHJONG_PROFILE=1.
+MAHJONG_PROFILE_CSV=<path> streams the samples to a CSV file.
+"""
+
+import csv
+import os
+import time
+from collections import deque
+
+import pygame
+
+from font_utils import get_default_font
+
+# Frame phases in the order main() marks them
+PHASES = ("idle", "events", "update", "background", "draw", "present", "tick")
+WINDOW_FRAMES = 240  # Frames the rolling statistics cover, 4 s at 60 fps
+HUD_REFRESH_FRAMES = 30  # Re-render the overlay text this often
+HUD_FONT_SIZE = 20
+HUD_LINE_HEIGHT = 18
+HUD_COLUMNS = (0, 90, 150, 210)  # x of the name, avg, p95 and p99 columns
+HUD_WIDTH = 270
+HUD_PADDING = 6
+HUD_POSITION = (10, 10)
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+class FrameProfiler:
+    def __init__(self, enabled=False, csv_path=None, window=WINDOW_FRAMES):
+        self.enabled = enabled
+        self.csv_path = csv_path
+        self.csv_file = None
+        self.csv_writer = None
+        self.frame = 0
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        self.current = dict.fromkeys(PHASES, 0.0)
+        # Rolling per-phase samples in ms, plus the whole frame
+        self.samples = {name: deque(maxlen=window) for name in PHASES + ("frame",)}
+        self.hud = None
+        self.hud_rect = pygame.Rect(HUD_POSITION, (HUD_WIDTH, HUD_PADDING * 2 + HUD_LINE_HEIGHT * (len(PHASES) + 2)))
+
+    @classmethod
+    def from_environment(cls):
+        enabled = os.environ.get("MAHJONG_PROFILE", "") not in ("", "0")
+        return cls(enabled, os.environ.get("MAHJONG_PROFILE_CSV") or None)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.hud = None
+        # Timings from before the pause would skew the statistics
+        for samples in self.samples.values():
+            samples.clear()
+        self.frame_start = 0.0
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frame_start = self.last_mark = now
+        for name in PHASES:
+            self.current[name] = 0.0
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to phase"""
+        if not self.enabled or not self.frame_start:
+            return
+        now = time.perf_counter()
+        self.current[phase] += (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def end_frame(self):
+        if not self.enabled or not self.frame_start:
+            return
+        total = (time.perf_counter() - self.frame_start) * 1000
+        for name in PHASES:
+            self.samples[name].append(self.current[name])
+        self.samples["frame"].append(total)
+        self.frame += 1
+        if self.csv_path:
+            self.write_row(total)
+        if self.frame % HUD_REFRESH_FRAMES == 0:
+            self.hud = None
+
+    def write_row(self, total):
+        if self.csv_writer is None:
+            self.csv_file = open(self.csv_path, "w", newline="")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(("frame",) + PHASES + ("frame_ms",))
+        self.csv_writer.writerow([self.frame] + [f"{self.current[name]:.3f}" for name in PHASES]
+                                 + [f"{total:.3f}"])
+
+    def stats(self, name):
+        """(average, p95, p99) in ms over the rolling window"""
+        values = sorted(self.samples[name])
+        if not values:
+            return 0.0, 0.0, 0.0
+        return sum(values) / len(values), percentile(values, 0.95), percentile(values, 0.99)
+
+    def render_hud(self):
+        hud = pygame.Surface(self.hud_rect.size)
+        hud.fill((0, 0, 0))
+        pygame.draw.rect(hud, (120, 120, 120), hud.get_rect(), 1)
+        font = get_default_font(HUD_FONT_SIZE)
+        frame_avg = self.stats("frame")[0]
+        fps = 1000 / frame_avg if frame_avg else 0.0
+        lines = [(f"{fps:.0f} fps", "avg", "p95", "p99")]
+        for name in PHASES + ("frame",):
+            lines.append((name,) + tuple(f"{value:.2f}" for value in self.stats(name)))
+        y = HUD_PADDING
+        for line in lines:
+            for x, cell in zip(HUD_COLUMNS, line):
+                hud.blit(font.render(cell, True, (255, 255, 255)), (HUD_PADDING + x, y))
+            y += HUD_LINE_HEIGHT
+        return hud
+
+    def draw(self, screen):
+        """Draw the overlay; returns the area it covers, or None when off"""
+        if not self.enabled:
+            return None
+        if self.hud is None:
+            self.hud = self.render_hud()
+        screen.blit(self.hud, self.hud_rect)
+        return self.hud_rect
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
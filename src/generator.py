@@ -0,0 +1,135 @@
+"""
+Board layout generation.
+
+Layouts are grids of tile type codes (None for an empty cell). The solvable
+generator constructs the solution first: starting from a full board it
+repeatedly picks two tiles that are connectable on the current board,
+gives them the same type and takes them off. Replaying those pairs in the
+same order clears the finished layout, so every board it returns can be
+solved, without a retry loop.
+
+    python src/generator.py --count 500 --seed 0 --certify
+"""
+
+import argparse
+import random
+import time
+
+from connectivity import can_link
+from solver import certify
+
+# 34 tile types: types 0-14 appear 4 times, types 15-33 twice, which fills
+# the standard 14x7 board with 49 pairs
+FOUR_OF_A_KIND_TYPES = 15
+TILE_TYPE_COUNT = 34
+
+def standard_pair_types(pair_count):
+    """Tile type of each pair, following the 15x4 + 19x2 distribution"""
+    pattern = []
+    for tile_type in range(FOUR_OF_A_KIND_TYPES):
+        pattern.extend([tile_type, tile_type])
+    pattern.extend(range(FOUR_OF_A_KIND_TYPES, TILE_TYPE_COUNT))
+    # Larger boards repeat the distribution, smaller ones use its start
+    return [pattern[i % len(pattern)] for i in range(pair_count)]
+
+def random_layout(width, height, rng=random):
+    """Shuffle the standard tiles into a grid without any solvability check"""
+    tile_types = []
+    for tile_type in standard_pair_types(width * height // 2):
+        tile_types.extend([tile_type, tile_type])
+    rng.shuffle(tile_types)
+    grid = [[None] * width for _ in range(height)]
+    for i, tile_type in enumerate(tile_types):
+        grid[i // width][i % width] = tile_type
+    return grid
+
+def _random_order(items, rng):
+    # Lazy Fisher-Yates shuffle: only the items actually consumed are drawn
+    items = items[:]
+    for i in range(len(items) - 1, -1, -1):
+        j = int(rng.random() * (i + 1))
+        items[i], items[j] = items[j], items[i]
+        yield items[i]
+
+def _pick_pair(occupied, width, height, cells, rng):
+    # Pick a random cell with at least one connectable partner, then a
+    # random such partner. Testing candidates in random order and taking
+    # the first hit is a uniform choice among the valid ones. can_link
+    # rejects a cell paired with itself.
+    for x1, y1 in _random_order(cells, rng):
+        for x2, y2 in _random_order(cells, rng):
+            if can_link(occupied, width, height, x1, y1, x2, y2):
+                return (x1, y1), (x2, y2)
+    # Unreachable: the topmost tiles of two different columns always link
+    # through the border ring, and two tiles sharing the only occupied
+    # column link directly.
+    raise RuntimeError("No connectable pair left while generating a layout")
+
+def construct_layout(width, height, cells, pair_types, rng):
+    """
+    Fill the given cells with the given pairs so the result can be cleared.
+    Works for any set of cells, so it also lays out a partly cleared board.
+    Returns (grid, solution).
+    """
+    cells = list(cells)
+    occupied = [[False] * width for _ in range(height)]
+    for x, y in cells:
+        occupied[y][x] = True
+
+    grid = [[None] * width for _ in range(height)]
+    solution = []
+    for tile_type in pair_types:
+        pos1, pos2 = _pick_pair(occupied, width, height, cells, rng)
+        for x, y in (pos1, pos2):
+            grid[y][x] = tile_type
+            occupied[y][x] = False
+            cells.remove((x, y))
+        solution.append((pos1, pos2))
+    return grid, solution
+
+def generate_layout(width, height, seed=None, rng=None):
+    """
+    Generate a layout that can be cleared completely.
+    Returns (grid, solution) where solution lists the pairs of positions
+    in an order that clears the board.
+    """
+    if rng is None:
+        rng = random.Random(seed)
+
+    pair_count = width * height // 2
+    pair_types = standard_pair_types(pair_count)
+    rng.shuffle(pair_types)
+
+    # With an odd number of cells one cell stays empty
+    cells = [(x, y) for y in range(height) for x in range(width)][:pair_count * 2]
+    return construct_layout(width, height, cells, pair_types, rng)
+
+def measure_generation_rate(width, height, count, seed=0):
+    """Generate count layouts and return the rate in boards per second"""
+    start = time.perf_counter()
+    for i in range(count):
+        generate_layout(width, height, seed=seed + i)
+    return count / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure solvable board generation speed")
+    parser.add_argument("--width", type=int, default=14)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--certify", action="store_true",
+                        help="also prove every generated board with the solver")
+    args = parser.parse_args()
+
+    rate = measure_generation_rate(args.width, args.height, args.count, args.seed)
+    print(f"{args.width}x{args.height}: {rate:.1f} boards/s over {args.count} boards")
+
+    if args.certify:
+        certified = 0
+        for i in range(args.count):
+            grid, _ = generate_layout(args.width, args.height, seed=args.seed + i)
+            certified += certify(grid, args.width, args.height)
+        print(f"Solver certified {certified}/{args.count} boards")
+
+if __name__ == "__main__":
+    main()
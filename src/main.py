@@ -2,9 +2,12 @@ import sys
 
 import pygame
 
+from asset_preloader import AssetPreloader
 from board import Board
+from frame_profiler import FrameProfiler
 from scrolling_background import ScrollingBackground
-from font_utils import get_chinese_font
+from font_utils import clear_font_cache, render_text
+from surface_pool import clear_overlays, get_overlay
 from utils import get_asset_path
 
 # Game states
@@ -20,18 +23,45 @@ BOARD_WIDTH = 14
 BOARD_HEIGHT = 7
 BACKGROUND_COLOR = (40, 40, 40)
 MARGIN = 80  # Minimum margin around board
+IDLE_WAIT_MS = 500  # Longest sleep while waiting for input on a still board
+RESIZE_SETTLE_MS = 150  # Quiet time after the last resize event before rescaling
+FPS = 60
 
-def main():
+class FrameInfo:
+    """What a script sees of the main loop at the start of a frame"""
+    def __init__(self, frame, game_state, board, start_button, start_pending,
+                 window_size, resizing):
+        self.frame = frame
+        self.game_state = game_state
+        self.board = board
+        self.start_button = start_button
+        self.start_pending = start_pending  # Start clicked, waiting for the preloader
+        self.window_size = window_size
+        self.resizing = resizing  # A new window size has not been applied yet
+
+def run_game(fps=FPS, script=None, board_seed=None, play_music=True, time_limits=True):
+    """
+    Run the game until the window is closed.
+
+    script, when given, is called at the start of every frame with a
+    FrameInfo and returns a list of events to handle along with the real
+    ones, or None to end the game. Scripted runs never sleep while the
+    board is idle, and fps=0 lifts the frame rate cap, so benchmarks can
+    replay input as fast as frames can be drawn. With time_limits off, the
+    board's background searches stop on node budgets only, so a seeded
+    game plays out the same way on every run.
+    """
     pygame.init()
     
     # Initialize background music
-    pygame.mixer.init()
-    try:
-        pygame.mixer.music.load(get_asset_path("audio", "background_music.mp3"))
-        pygame.mixer.music.set_volume(0.5)  # Set volume to 50%
-        pygame.mixer.music.play(-1)  # -1 means infinite loop
-    except pygame.error:
-        print("Could not load background music")
+    if play_music:
+        pygame.mixer.init()
+        try:
+            pygame.mixer.music.load(get_asset_path("audio", "background_music.mp3"))
+            pygame.mixer.music.set_volume(0.5)  # Set volume to 50%
+            pygame.mixer.music.play(-1)  # -1 means infinite loop
+        except pygame.error:
+            print("Could not load background music")
     
     screen = pygame.display.set_mode((INITIAL_WIDTH, INITIAL_HEIGHT), pygame.RESIZABLE)
     pygame.display.set_caption("Mahjong Link Game")
@@ -69,8 +99,12 @@ def main():
     board_pixel_height = BOARD_HEIGHT * tile_height
     game_state = START_SCREEN
     
+    # Build the tile sprites for the first board while the start screen shows
+    preloader = AssetPreloader(tile_width, tile_height)
+    start_pending = False  # Start was clicked before the preloader finished
+    
     # Initialize scrolling background
-    scrolling_bg = ScrollingBackground(current_width, current_height)
+    scrolling_bg = ScrollingBackground(current_width, current_height, BACKGROUND_COLOR)
     
     # Start screen button (scale with window)
     scale_factor = min(current_width / INITIAL_WIDTH, current_height / INITIAL_HEIGHT)
@@ -90,38 +124,65 @@ def main():
     board = None
     
     clock = pygame.time.Clock()
+    profiler = FrameProfiler.from_environment()
     running = True
+    # During play only changed areas are presented; anything that changes
+    # the whole window asks for one full redraw first
+    full_redraw = True
+    idle = False
+    # Size waiting to be applied, and the off-screen frame drawn at the old
+    # size and stretched over the window until then
+    resize_size = None
+    resize_deadline = 0
+    resize_frame = None
+    frame = 0
     
     while running:
-        for event in pygame.event.get():
+        profiler.begin_frame()
+        if idle and script is None:
+            # Nothing moves on screen: sleep until an event arrives instead
+            # of redrawing the same frame 60 times a second. Window events
+            # wake it too, and an expose is answered with a full redraw
+            events = [pygame.event.wait(IDLE_WAIT_MS)]
+            profiler.mark("idle")
+            events.extend(pygame.event.get())
+        else:
+            events = pygame.event.get()
+        
+        if script is not None:
+            scripted = script(FrameInfo(frame, game_state, board, start_button, start_pending,
+                                        (current_width, current_height), resize_size is not None))
+            if scripted is None:
+                running = False
+            else:
+                events.extend(scripted)
+        frame += 1
+        
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.VIDEORESIZE:
-                current_width, current_height = event.w, event.h
-                screen = pygame.display.set_mode((current_width, current_height), pygame.RESIZABLE)
-                
-                # Recalculate tile size
-                tile_width, tile_height = calculate_tile_size()
-                board_pixel_width = BOARD_WIDTH * tile_width
-                board_pixel_height = BOARD_HEIGHT * tile_height
-                offset_x, offset_y = calculate_board_position(tile_width, tile_height)
-                
-                if board:
-                    board.update_size_and_position(tile_width, tile_height, offset_x, offset_y)
-                scrolling_bg = ScrollingBackground(current_width, current_height)
-                
-                # Update button size and position on resize
-                scale_factor = min(current_width / INITIAL_WIDTH, current_height / INITIAL_HEIGHT)
-                button_width = int(200 * scale_factor)
-                button_height = int(60 * scale_factor)
-                start_button.width = button_width
-                start_button.height = button_height
-                start_button.center = (current_width // 2, current_height // 2 + int(100 * scale_factor))
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+                # Dragging a window edge sends a stream of these; only the
+                # last size is applied, once no new one came for a moment
+                if resize_frame is None:
+                    resize_frame = pygame.Surface((current_width, current_height))
+                resize_size = (event.w, event.h)
+                resize_deadline = pygame.time.get_ticks() + RESIZE_SETTLE_MS
+                full_redraw = True
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN):
+                # The window contents may have been lost while it was covered
+                # or minimised, and dirty rects would only repaint what changed
+                full_redraw = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                # Frame timing overlay on and off
+                profiler.toggle()
+                full_redraw = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and resize_size is None:
+                # Clicks on the stretched resize preview are ignored
                 if game_state == START_SCREEN:
                     if start_button.collidepoint(event.pos):
-                        game_state = PLAYING
-                        board = Board(BOARD_WIDTH, BOARD_HEIGHT, tile_width, tile_height, offset_x, offset_y)
+                        # The board is created once the preloader is done
+                        start_pending = True
                 elif game_state == PLAYING:
                     if board:
                         board.handle_click(event.pos)
@@ -132,44 +193,99 @@ def main():
                     if board:
                         board.handle_click(event.pos)
         
+        if resize_size is not None and pygame.time.get_ticks() >= resize_deadline:
+            # Single rescale pass for the settled size
+            current_width, current_height = resize_size
+            resize_size = None
+            resize_frame = None
+            screen = pygame.display.set_mode((current_width, current_height), pygame.RESIZABLE)
+            
+            # Recalculate tile size
+            tile_width, tile_height = calculate_tile_size()
+            board_pixel_width = BOARD_WIDTH * tile_width
+            board_pixel_height = BOARD_HEIGHT * tile_height
+            offset_x, offset_y = calculate_board_position(tile_width, tile_height)
+            
+            if board:
+                board.update_size_and_position(tile_width, tile_height, offset_x, offset_y)
+            elif (tile_width, tile_height) != (preloader.tile_width, preloader.tile_height):
+                # The first board will use the new tile size
+                preloader.cancel()
+                preloader = AssetPreloader(tile_width, tile_height)
+            full_redraw = True
+            clear_overlays()
+            scrolling_bg = ScrollingBackground(current_width, current_height, BACKGROUND_COLOR)
+            
+            # Update button size and position on resize
+            scale_factor = min(current_width / INITIAL_WIDTH, current_height / INITIAL_HEIGHT)
+            button_width = int(200 * scale_factor)
+            button_height = int(60 * scale_factor)
+            start_button.width = button_width
+            start_button.height = button_height
+            start_button.center = (current_width // 2, current_height // 2 + int(100 * scale_factor))
+        profiler.mark("events")
+        
         # Update
         if game_state == START_SCREEN:
             scrolling_bg.update()
+            if start_pending and preloader.is_done():
+                start_pending = False
+                game_state = PLAYING
+                board = Board(BOARD_WIDTH, BOARD_HEIGHT, tile_width, tile_height, offset_x, offset_y,
+                              seed=board_seed, background_color=BACKGROUND_COLOR,
+                              time_limits=time_limits)
         elif game_state == PLAYING and board:
             board.update()
             if board.game_completed:
                 game_state = END_SCREEN
         elif game_state == END_SCREEN and board:
             board.update()
+        profiler.mark("update")
         
         # Draw
+        if resize_size is not None:
+            # Keep drawing at the old size while the window is being resized
+            screen = resize_frame
+        
+        if game_state == PLAYING and board and not full_redraw:
+            dirty_rects = board.draw_dirty(screen)
+            hud_rect = profiler.draw(screen)
+            if hud_rect:
+                dirty_rects.append(hud_rect)
+            profiler.mark("draw")
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+            profiler.mark("present")
+            idle = board.is_idle()
+            clock.tick(fps)
+            profiler.mark("tick")
+            profiler.end_frame()
+            continue
+        
         screen.fill(BACKGROUND_COLOR)
         
         if game_state == START_SCREEN:
             # Draw scrolling background
             scrolling_bg.draw(screen)
+            profiler.mark("background")
             
             # Draw semi-transparent overlay
-            overlay = pygame.Surface((current_width, current_height))
-            overlay.set_alpha(150)
-            overlay.fill((0, 0, 0))
-            screen.blit(overlay, (0, 0))
+            screen.blit(get_overlay((current_width, current_height), (0, 0, 0), 150), (0, 0))
             
             # Draw title with shadow effect
             # Scale font size based on window size
             title_font_size = int(96 * min(current_width / INITIAL_WIDTH, current_height / INITIAL_HEIGHT))
             title_font_size = max(title_font_size, 48)  # Minimum font size
-            font_title = get_chinese_font(title_font_size)
                 
             # Draw shadow
-            text_shadow = font_title.render("麻將連連看", True, (50, 30, 0))
+            text_shadow = render_text("麻將連連看", title_font_size, (50, 30, 0))
             shadow_rect = text_shadow.get_rect(
                 center=(current_width // 2 + 3, current_height // 2 - 100 + 3)
             )
             screen.blit(text_shadow, shadow_rect)
             
             # Draw main text
-            text_title = font_title.render("麻將連連看", True, (255, 215, 0))
+            text_title = render_text("麻將連連看", title_font_size, (255, 215, 0))
             title_rect = text_title.get_rect(
                 center=(current_width // 2, current_height // 2 - 100)
             )
@@ -177,14 +293,22 @@ def main():
             
             # Draw start button
             pygame.draw.rect(screen, (0, 100, 0), start_button)
+            if start_pending:
+                # Loading bar filling the button from the left
+                progress = preloader.progress()
+                progress_rect = start_button.copy()
+                progress_rect.width = int(start_button.width * progress)
+                pygame.draw.rect(screen, (0, 150, 0), progress_rect)
             pygame.draw.rect(screen, (0, 200, 0), start_button, 3)
             
             # Scale button font size
             button_font_size = int(36 * min(current_width / INITIAL_WIDTH, current_height / INITIAL_HEIGHT))
             button_font_size = max(button_font_size, 20)  # Minimum font size
-            font_button = get_chinese_font(button_font_size)
                 
-            text_start = font_button.render("開始遊戲", True, (255, 255, 255))
+            if start_pending:
+                text_start = render_text(f"載入中 {int(progress * 100)}%", button_font_size, (255, 255, 255))
+            else:
+                text_start = render_text("開始遊戲", button_font_size, (255, 255, 255))
             text_rect = text_start.get_rect(center=start_button.center)
             screen.blit(text_start, text_rect)
             
@@ -200,12 +324,35 @@ def main():
             if not board.game_completed:
                 game_state = PLAYING
         
+        profiler.draw(screen)
+        profiler.mark("draw")
+        
+        if resize_size is not None:
+            # Cheap stretched preview of the frame
+            window = pygame.display.get_surface()
+            window.blit(pygame.transform.scale(resize_frame, window.get_size()), (0, 0))
+        
         pygame.display.flip()
-        clock.tick(60)
+        profiler.mark("present")
+        full_redraw = game_state != PLAYING or resize_size is not None
+        idle = False
+        clock.tick(fps)
+        profiler.mark("tick")
+        profiler.end_frame()
+    
+    preloader.cancel()
+    profiler.close()
+    if board:
+        board.analysis_worker.stop()
     
     # Stop music before quitting
-    pygame.mixer.music.stop()
+    if play_music:
+        pygame.mixer.music.stop()
     pygame.quit()
+    clear_font_cache()
+
+def main():
+    run_game()
     sys.exit()
 
 if __name__ == "__main__":
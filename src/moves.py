@@ -0,0 +1,72 @@
+"""
+Move search over a per-type position index.
+
+A type index maps each tile type to the set of (x, y) cells still holding
+that type. Only tiles of the same type can be matched, so searching pairs
+within each type replaces the all-cells-against-all-cells scan.
+"""
+
+from itertools import combinations
+
+from connectivity import can_link
+
+def build_type_index(grid, width, height, type_of=None):
+    """Map each tile type to the set of positions holding it"""
+    type_positions = {}
+    for y in range(height):
+        for x in range(width):
+            cell = grid[y][x]
+            if cell is None or cell is False:
+                continue
+            tile_type = type_of(cell) if type_of else cell
+            type_positions.setdefault(tile_type, set()).add((x, y))
+    return type_positions
+
+def iter_candidate_pairs(type_positions):
+    """Yield every unordered pair of same-type positions once"""
+    for positions in type_positions.values():
+        if len(positions) > 1:
+            yield from combinations(sorted(positions), 2)
+
+def find_moves(grid, width, height, type_positions):
+    """List every pair of positions that can currently be matched"""
+    return [(pos1, pos2) for pos1, pos2 in iter_candidate_pairs(type_positions)
+            if can_link(grid, width, height, pos1[0], pos1[1], pos2[0], pos2[1])]
+
+def has_move(grid, width, height, type_positions):
+    """Check whether at least one pair can currently be matched"""
+    for pos1, pos2 in iter_candidate_pairs(type_positions):
+        if can_link(grid, width, height, pos1[0], pos1[1], pos2[0], pos2[1]):
+            return True
+    return False
+
+def crosses_freed_cells(pos1, pos2, freed):
+    # Every segment of a path with at most two turns runs along the row or
+    # column of one of the tiles, or is a middle segment spanning the
+    # columns (or rows) between them. A freed cell can only open a new path
+    # for pairs whose corridors reach its row or column.
+    (x1, y1), (x2, y2) = pos1, pos2
+    min_x, max_x = min(x1, x2), max(x1, x2)
+    min_y, max_y = min(y1, y2), max(y1, y2)
+    for fx, fy in freed:
+        if min_x <= fx <= max_x or min_y <= fy <= max_y:
+            return True
+    return False
+
+def update_moves(grid, width, height, type_positions, moves, freed):
+    """
+    Bring a live-move set up to date after the cells in freed were emptied.
+    type_positions must already exclude the freed cells. Removing tiles
+    never breaks another pair's path, so only moves involving the freed
+    cells are dropped and only pairs crossing them are re-tested.
+    """
+    freed = list(freed)
+    moves.difference_update([move for move in moves
+                             if move[0] in freed or move[1] in freed])
+    for move in iter_candidate_pairs(type_positions):
+        if move in moves or not crosses_freed_cells(move[0], move[1], freed):
+            continue
+        (x1, y1), (x2, y2) = move
+        if can_link(grid, width, height, x1, y1, x2, y2):
+            moves.add(move)
+    return moves
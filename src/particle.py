@@ -1,72 +1,114 @@
 import random
 
+import numpy as np
 import pygame
 
-class Particle:
-    def __init__(self, x, y, color=None):
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-8, 8)
-        self.vy = random.uniform(-15, -5)
-        self.gravity = 0.5
-        self.lifetime = random.randint(30, 60)
-        self.age = 0
-        
-        if color is None:
-            self.color = (
-                random.randint(100, 255),
-                random.randint(100, 255),
-                random.randint(100, 255)
-            )
-        else:
-            self.color = color
-            
-        self.size = random.randint(2, 4)
-        self.current_color = self.color
-        
+MAX_PARTICLES = 4096
+GRAVITY = 0.5
+MIN_SIZE = 2
+MAX_SIZE = 4
+# Sparks fade in steps, so a burst needs one dot sprite per size and step
+FADE_LEVELS = 8
+SPRITES_PER_BURST = (MAX_SIZE - MIN_SIZE + 1) * FADE_LEVELS
+# Bursts whose sprites are kept; slots are reused round-robin, long after
+# the sparks of a slot's previous burst have died
+MAX_BURSTS = 256
+
+def render_dot(size, color):
+    """Filled circle of the given radius, with black as the colour key"""
+    dot = pygame.Surface((size * 2 + 1, size * 2 + 1))
+    if pygame.display.get_surface():
+        dot = dot.convert()
+    dot.set_colorkey((0, 0, 0))
+    pygame.draw.circle(dot, color, (size, size), size)
+    return dot
+
+class ParticleSystem:
+    """
+    Fixed-capacity pool of sparks stored as parallel NumPy arrays, updated
+    in one vectorized step and drawn with a single Surface.blits call.
+    """
+    def __init__(self, capacity=MAX_PARTICLES, seed=None):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.lifetime = np.ones(capacity, dtype=np.int32)
+        self.size = np.full(capacity, MIN_SIZE, dtype=np.int32)
+        self.burst = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Dot sprites of every burst colour, indexed by
+        # burst * SPRITES_PER_BURST + (size - MIN_SIZE) * FADE_LEVELS + fade step
+        self.sprites = np.empty(MAX_BURSTS * SPRITES_PER_BURST, dtype=object)
+        self.next_burst = 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def emit(self, x, y, count, color):
+        """Burst of count sparks from (x, y); sparks beyond the capacity are dropped"""
+        slots = np.flatnonzero(~self.alive)[:count]
+        n = len(slots)
+        if n == 0:
+            return
+        burst = self.next_burst
+        self.next_burst = (burst + 1) % MAX_BURSTS
+        first = burst * SPRITES_PER_BURST
+        for size in range(MIN_SIZE, MAX_SIZE + 1):
+            for step in range(FADE_LEVELS):
+                fade = (step + 1) / FADE_LEVELS
+                faded = tuple(int(channel * fade) for channel in color)
+                self.sprites[first + (size - MIN_SIZE) * FADE_LEVELS + step] = render_dot(size, faded)
+
+        self.position[slots] = (x, y)
+        self.velocity[slots, 0] = self.rng.uniform(-8, 8, n)
+        self.velocity[slots, 1] = self.rng.uniform(-15, -5, n)
+        self.age[slots] = 0
+        self.lifetime[slots] = self.rng.integers(30, 61, n)
+        self.size[slots] = self.rng.integers(MIN_SIZE, MAX_SIZE + 1, n)
+        self.burst[slots] = burst
+        self.alive[slots] = True
+
     def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += self.gravity
-        self.age += 1
-        
-        # Fade out
-        fade_factor = 1 - (self.age / self.lifetime)
-        self.current_color = (
-            int(self.color[0] * fade_factor),
-            int(self.color[1] * fade_factor),
-            int(self.color[2] * fade_factor)
-        )
-        
+        alive = self.alive
+        self.position[alive] += self.velocity[alive]
+        self.velocity[alive, 1] += GRAVITY
+        self.age[alive] += 1
+        self.alive &= self.age < self.lifetime
+
     def draw(self, screen):
-        if self.age < self.lifetime:
-            pygame.draw.circle(screen, self.current_color, 
-                             (int(self.x), int(self.y)), self.size)
-            
-    def is_alive(self):
-        return self.age < self.lifetime
+        slots = np.flatnonzero(self.alive)
+        if len(slots) == 0:
+            return
+        # Fade out, rounded up to the next step so a spark never turns
+        # fully black before it dies
+        remaining = 1 - self.age[slots] / self.lifetime[slots]
+        step = np.ceil(remaining * FADE_LEVELS).astype(np.int32) - 1
+        sizes = self.size[slots]
+        index = self.burst[slots] * SPRITES_PER_BURST + (sizes - MIN_SIZE) * FADE_LEVELS + step
+        corners = (self.position[slots] - sizes[:, None]).astype(np.int32)
+        screen.blits(zip(self.sprites[index].tolist(), corners.tolist()), doreturn=False)
+
+    def clear(self):
+        self.alive[:] = False
 
 class Firework:
+    """A rocket climbing to its burst height"""
     def __init__(self, x, y):
-        self.particles = []
         self.exploded = False
         self.rocket_y = y
         self.rocket_x = x
         self.target_y = random.randint(100, 300)
         self.rocket_speed = -10
-        
-    def update(self):
+
+    def update(self, particles):
         if not self.exploded:
             self.rocket_y += self.rocket_speed
             if self.rocket_y <= self.target_y:
-                self.explode()
-        else:
-            for particle in self.particles[:]:
-                particle.update()
-                if not particle.is_alive():
-                    self.particles.remove(particle)
-                    
-    def explode(self):
+                self.explode(particles)
+
+    def explode(self, particles):
         self.exploded = True
         num_particles = random.randint(30, 50)
         color = (
@@ -74,16 +116,36 @@ class Firework:
             random.randint(100, 255),
             random.randint(100, 255)
         )
-        for _ in range(num_particles):
-            self.particles.append(Particle(self.rocket_x, self.rocket_y, color))
-            
+        particles.emit(self.rocket_x, self.rocket_y, num_particles, color)
+
     def draw(self, screen):
         if not self.exploded:
-            pygame.draw.circle(screen, (255, 255, 200), 
+            pygame.draw.circle(screen, (255, 255, 200),
                              (int(self.rocket_x), int(self.rocket_y)), 3)
-        else:
-            for particle in self.particles:
-                particle.draw(screen)
-                
+
     def is_alive(self):
-        return not self.exploded or len(self.particles) > 0
\ No newline at end of file
+        return not self.exploded
+
+class FireworkShow:
+    """Rockets in flight plus the shared pool of sparks from their bursts"""
+    def __init__(self, capacity=MAX_PARTICLES):
+        self.rockets = []
+        self.particles = ParticleSystem(capacity)
+
+    def launch(self, x, y):
+        self.rockets.append(Firework(x, y))
+
+    def update(self):
+        for rocket in self.rockets:
+            rocket.update(self.particles)
+        self.rockets = [rocket for rocket in self.rockets if rocket.is_alive()]
+        self.particles.update()
+
+    def draw(self, screen):
+        for rocket in self.rockets:
+            rocket.draw(screen)
+        self.particles.draw(screen)
+
+    def clear(self):
+        self.rockets = []
+        self.particles.clear()
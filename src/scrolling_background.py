@@ -1,130 +1,76 @@
-import os
 import random
 
 import pygame
 
-from utils import get_asset_path
+from surface_pool import get_overlay
+from tile_cache import get_tile_image
 
-class ScrollingTile:
-    def __init__(self, x, y, tile_type, speed):
-        self.x = x
-        self.y = y
-        self.tile_type = tile_type
-        self.speed = speed
-        self.width = 60
-        self.height = 80
-        self.image = None
-        self.load_image()
-        
-    def load_image(self):
-        try:
-            image_path = get_asset_path("tiles", f"{self.tile_type}.svg")
-            self.image = pygame.image.load(image_path)
-            self.image = pygame.transform.scale(self.image, (self.width, self.height))
-            # Make it semi-transparent
-            self.image.set_alpha(100)
-        except (pygame.error, IOError, OSError, FileNotFoundError):
-            self.image = None
-                
-    def update(self):
-        self.x += self.speed
-        
-    def draw(self, screen):
-        # Draw white background for tile
-        white_bg = pygame.Surface((self.width, self.height))
-        white_bg.fill((255, 255, 255))
-        white_bg.set_alpha(100)
-        screen.blit(white_bg, (self.x, self.y))
-        
-        if self.image:
-            screen.blit(self.image, (self.x, self.y))
-        else:
-            # Fallback to rectangle if image not found
-            surf = pygame.Surface((self.width, self.height))
-            surf.set_alpha(100)
-            surf.fill((150, 150, 150))
-            screen.blit(surf, (self.x, self.y))
-            
-        # Draw border
-        border_color = (180, 180, 180, 100)
-        pygame.draw.rect(screen, border_color, pygame.Rect(self.x, self.y, self.width, self.height), 2)
+SCROLL_TILE_WIDTH = 60
+SCROLL_TILE_HEIGHT = 80
+
+def draw_scrolling_tile(surface, x, y, tile_type):
+    # Semi-transparent tile: white background, faded image, border
+    size = (SCROLL_TILE_WIDTH, SCROLL_TILE_HEIGHT)
+    surface.blit(get_overlay(size, (255, 255, 255), 100), (x, y))
+
+    image = get_tile_image(tile_type, SCROLL_TILE_WIDTH, SCROLL_TILE_HEIGHT, alpha=100)
+    if image:
+        surface.blit(image, (x, y))
+    else:
+        # Fallback to rectangle if image not found
+        surface.blit(get_overlay(size, (150, 150, 150), 100), (x, y))
+
+    pygame.draw.rect(surface, (180, 180, 180), pygame.Rect(x, y, *size), 2)
 
 class ScrollingBackground:
-    def __init__(self, screen_width, screen_height):
+    """
+    Rows of faded tiles drifting to the right behind the start screen.
+    Every row is pre-rendered once into an opaque strip that repeats
+    seamlessly, so a frame is two blits per row at a wrapping offset.
+    """
+    def __init__(self, screen_width, screen_height, background_color=(40, 40, 40)):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.tiles = []
+        self.background_color = background_color
         self.tile_spacing_x = 180  # Horizontal spacing
         self.tile_spacing_y = 120  # Vertical spacing for diagonal
         self.base_speed = 1.0  # Fixed speed for all tiles
-        self.rows = []  # Track tiles by row
-        self.spawn_offset = 0  # Track position for new tiles
-        
-        # Create rows to fill the entire screen
-        self.row_configs = []
-        
+        self.scroll = 0.0  # Distance travelled so far
+
+        # A strip holds whole tile spacings and is at least one spacing
+        # wider than the screen, so two copies always cover it
+        tiles_per_strip = int(screen_width / self.tile_spacing_x) + 2
+        self.strip_width = tiles_per_strip * self.tile_spacing_x
+
         # Calculate number of rows needed to fill screen
         num_rows = int(screen_height / self.tile_spacing_y) + 2
-        
+
         # Configure each row with different starting positions and y coordinates
+        self.row_configs = []
         for i in range(num_rows):
             y_base = i * self.tile_spacing_y - self.tile_spacing_y  # Start above screen
             # Alternate rows start at different x positions for diagonal effect
-            x_offset = (i % 2) * (self.tile_spacing_x / 2)
+            x_offset = (i % 2) * (self.tile_spacing_x // 2)
             self.row_configs.append({
                 'y': y_base,
-                'x_offset': x_offset,
-                'tiles': []
+                'x_offset': x_offset - 200,
+                'strip': self.render_strip(tiles_per_strip),
             })
-        
-        # Initialize with tiles
-        for row_idx, config in enumerate(self.row_configs):
-            # Start with enough tiles to fill the screen
-            num_initial_tiles = int(screen_width / self.tile_spacing_x) + 3
-            for i in range(num_initial_tiles):
-                x = config['x_offset'] + i * self.tile_spacing_x - 200
-                self.spawn_tile_in_row(row_idx, x)
-            
-    def spawn_tile_in_row(self, row_idx, x_pos):
-        config = self.row_configs[row_idx]
-        y = config['y']
-        tile_type = random.randint(0, 31)
-        tile = ScrollingTile(x_pos, y, tile_type, self.base_speed)
-        self.tiles.append(tile)
-        config['tiles'].append(tile)
-            
+
+    def render_strip(self, tile_count):
+        strip = pygame.Surface((self.strip_width, SCROLL_TILE_HEIGHT))
+        if pygame.display.get_surface():
+            strip = strip.convert()
+        strip.fill(self.background_color)
+        for i in range(tile_count):
+            draw_scrolling_tile(strip, i * self.tile_spacing_x, 0, random.randint(0, 31))
+        return strip
+
     def update(self):
-        # Update all tiles
-        for config in self.row_configs:
-            tiles_to_remove = []
-            
-            for tile in config['tiles']:
-                tile.update()
-                # Mark tiles that have scrolled off screen for removal
-                if tile.x > self.screen_width + 100:
-                    tiles_to_remove.append(tile)
-            
-            # Remove tiles that are off screen
-            for tile in tiles_to_remove:
-                config['tiles'].remove(tile)
-                self.tiles.remove(tile)
-        
-        # Check each row to see if new tiles are needed
-        for row_idx, config in enumerate(self.row_configs):
-            tiles = config['tiles']
-            
-            # Need to check the leftmost tile (first in list since we spawn from left)
-            if tiles:
-                leftmost_tile = min(tiles, key=lambda t: t.x)
-                # Spawn new tile if the leftmost has moved far enough
-                # from the left edge
-                if leftmost_tile.x > -50:
-                    new_x = leftmost_tile.x - self.tile_spacing_x
-                    self.spawn_tile_in_row(row_idx, new_x)
-            else:
-                # No tiles in this row, spawn one
-                self.spawn_tile_in_row(row_idx, -100)
-            
+        self.scroll = (self.scroll + self.base_speed) % self.strip_width
+
     def draw(self, screen):
-        for tile in self.tiles:
-            tile.draw(screen)
\ No newline at end of file
+        for config in self.row_configs:
+            offset = (int(self.scroll) + config['x_offset']) % self.strip_width
+            screen.blit(config['strip'], (offset - self.strip_width, config['y']))
+            screen.blit(config['strip'], (offset, config['y']))
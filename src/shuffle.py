@@ -0,0 +1,78 @@
+"""
+Shuffling the remaining tiles of a board.
+
+Candidates are plain lists of tile types for the occupied cells, tried on
+a scratch type grid, so no Tile object or image is touched until a layout
+has been chosen. A candidate without any move is rejected with the cheap
+early-exit move check. With ensure_solvable, survivors must also be proven
+clearable by a budgeted solver run. If no random candidate passes, the
+remaining pairs are laid out by reverse construction, which always gives
+a clearable board.
+"""
+
+import random
+from collections import Counter
+
+from generator import construct_layout
+from moves import build_type_index, find_moves, has_move
+from solver import certify
+
+MAX_SHUFFLE_ATTEMPTS = 50
+# Solver budget when the shuffle has to stay solvable: a few candidates,
+# each with a small search, before falling back to reverse construction
+MAX_CERTIFIED_CANDIDATES = 5
+CANDIDATE_MAX_NODES = 2000
+CANDIDATE_TIME_LIMIT = 0.05  # seconds
+
+def occupied_positions(grid, width, height):
+    """Occupied cells in row-major order"""
+    return [(x, y) for y in range(height) for x in range(width) if grid[y][x] is not None]
+
+def shuffle_types(grid, width, height, rng=random, ensure_solvable=False,
+                  max_attempts=MAX_SHUFFLE_ATTEMPTS, time_limit=CANDIDATE_TIME_LIMIT):
+    """
+    Find a new arrangement of the tile types on the occupied cells.
+    Returns (types, live moves, attempts), where types follows the
+    occupied cells in row-major order, or (None, None, attempts) if no
+    arrangement with a move was found. With time_limit None, candidates
+    are only bounded by their node budget, so a seeded rng always gives
+    the same result.
+    """
+    positions = occupied_positions(grid, width, height)
+    if len(positions) < 2:
+        return None, None, 0
+
+    tile_types = [grid[y][x] for x, y in positions]
+    candidate = [[None] * width for _ in range(height)]
+    certified = 0
+    attempt = 0
+
+    for attempt in range(1, max_attempts + 1):
+        rng.shuffle(tile_types)
+        for (x, y), tile_type in zip(positions, tile_types):
+            candidate[y][x] = tile_type
+
+        type_positions = build_type_index(candidate, width, height)
+        if not has_move(candidate, width, height, type_positions):
+            continue
+        if ensure_solvable:
+            if certified == MAX_CERTIFIED_CANDIDATES:
+                break
+            certified += 1
+            if not certify(candidate, width, height, CANDIDATE_MAX_NODES, time_limit):
+                continue
+        return tile_types, set(find_moves(candidate, width, height, type_positions)), attempt
+
+    if not ensure_solvable:
+        return None, None, max_attempts
+
+    # Reverse construction over the remaining cells and pairs
+    attempts = attempt + 1
+    pair_types = []
+    for tile_type, count in Counter(tile_types).items():
+        pair_types.extend([tile_type] * (count // 2))
+    rng.shuffle(pair_types)
+    candidate, _ = construct_layout(width, height, positions, pair_types, rng)
+    type_positions = build_type_index(candidate, width, height)
+    return ([candidate[y][x] for x, y in positions],
+            set(find_moves(candidate, width, height, type_positions)), attempts)
@@ -0,0 +1,149 @@
+"""
+Depth-first solver for link boards.
+
+The search removes one connectable pair per step. Positions are hashed with
+Zobrist keys (one random 64-bit key per cell, XORed for every occupied
+cell), and positions already proven to be dead ends are kept in a
+transposition table so different removal orders reaching the same position
+are only explored once.
+
+Move ordering:
+- A connectable pair whose type has exactly two tiles left is always safe
+  to take, because removing tiles never blocks another path and the pair
+  has to go eventually. Such a move is played without branching.
+- Otherwise types with fewer tiles left come first, then shorter links.
+"""
+
+import random
+import time
+
+from moves import build_type_index, find_moves, update_moves
+
+DEFAULT_MAX_NODES = 200000
+DEFAULT_TIME_LIMIT = 2.0  # seconds
+
+# Result status values
+SOLVED = "solved"
+UNSOLVABLE = "unsolvable"
+BUDGET_EXHAUSTED = "budget_exhausted"
+
+class SolveResult:
+    def __init__(self, status, solution, nodes, elapsed, table_probes, table_hits):
+        self.status = status
+        self.solution = solution  # List of ((x1, y1), (x2, y2)) or None
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.table_probes = table_probes
+        self.table_hits = table_hits
+
+    @property
+    def solved(self):
+        return self.status == SOLVED
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else float(self.nodes)
+
+    @property
+    def table_hit_rate(self):
+        return self.table_hits / self.table_probes if self.table_probes else 0.0
+
+    def summary(self):
+        return (f"{self.status}: {self.nodes} nodes in {self.elapsed:.3f}s "
+                f"({self.nodes_per_second:.0f} nodes/s, "
+                f"table hit rate {self.table_hit_rate:.1%})")
+
+class Solver:
+    def __init__(self, max_nodes=DEFAULT_MAX_NODES, time_limit=DEFAULT_TIME_LIMIT):
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+
+    def solve(self, grid, width, height):
+        """Search for a removal sequence that clears a grid of tile types"""
+        grid = [list(row) for row in grid]
+        type_positions = build_type_index(grid, width, height)
+        moves = set(find_moves(grid, width, height, type_positions))
+
+        # Zobrist keys, seeded so hashes are reproducible between runs
+        key_rng = random.Random(width * 100003 + height)
+        keys = [[key_rng.getrandbits(64) for _ in range(width)] for _ in range(height)]
+        position_hash = 0
+        for positions in type_positions.values():
+            for x, y in positions:
+                position_hash ^= keys[y][x]
+
+        dead_positions = set()
+        nodes = 0
+        probes = 0
+        hits = 0
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit else None
+
+        def ordered_moves(moves):
+            # Safe moves: the last two tiles of a type, already connectable
+            for move in sorted(moves):
+                x, y = move[0]
+                if len(type_positions[grid[y][x]]) == 2:
+                    return [move]
+
+            def priority(move):
+                (x1, y1), (x2, y2) = move
+                return (len(type_positions[grid[y1][x1]]), abs(x1 - x2) + abs(y1 - y2), move)
+            return sorted(moves, key=priority)
+
+        def result(status, solution):
+            return SolveResult(status, solution, nodes, time.perf_counter() - start,
+                               probes, hits)
+
+        # Iterative DFS; each frame is (position hash, moves, untried moves, played move)
+        stack = [(position_hash, moves, ordered_moves(moves), None)]
+        solution = []
+        while stack:
+            position_hash, moves, untried, _ = stack[-1]
+
+            if not type_positions:
+                return result(SOLVED, solution[:])
+
+            if not untried:
+                # Dead end: remember it and undo the move that led here
+                dead_positions.add(position_hash)
+                _, _, _, played = stack.pop()
+                if played is None:
+                    break
+                solution.pop()
+                for x, y, tile_type in played:
+                    grid[y][x] = tile_type
+                    type_positions.setdefault(tile_type, set()).add((x, y))
+                continue
+
+            nodes += 1
+            if nodes > self.max_nodes or (
+                    deadline and time.perf_counter() > deadline):
+                return result(BUDGET_EXHAUSTED, None)
+
+            move = untried.pop(0)
+            (x1, y1), (x2, y2) = move
+            child_hash = position_hash ^ keys[y1][x1] ^ keys[y2][x2]
+            probes += 1
+            if child_hash in dead_positions:
+                hits += 1
+                continue
+
+            tile_type = grid[y1][x1]
+            played = [(x1, y1, tile_type), (x2, y2, tile_type)]
+            for x, y, _ in played:
+                grid[y][x] = None
+                positions = type_positions[tile_type]
+                positions.discard((x, y))
+                if not positions:
+                    del type_positions[tile_type]
+            child_moves = update_moves(grid, width, height, type_positions,
+                                       set(moves), [move[0], move[1]])
+            solution.append(move)
+            stack.append((child_hash, child_moves, ordered_moves(child_moves), played))
+
+        return result(UNSOLVABLE, None)
+
+def certify(grid, width, height, max_nodes=DEFAULT_MAX_NODES, time_limit=DEFAULT_TIME_LIMIT):
+    """Check that a grid of tile types can be cleared within the search budget"""
+    return Solver(max_nodes, time_limit).solve(grid, width, height).solved
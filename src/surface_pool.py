@@ -0,0 +1,36 @@
+import pygame
+
+from utils import LRUCache
+
+# Full-window overlays for a couple of window sizes plus the small ones
+MAX_POOLED_SURFACES = 16
+
+class SurfacePool:
+    """Pre-filled translucent surfaces, shared by every draw that needs one"""
+    def __init__(self, max_entries=MAX_POOLED_SURFACES):
+        self.surfaces = LRUCache(max_entries)
+
+    def get(self, size, color, alpha):
+        key = (tuple(size), tuple(color), alpha)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = pygame.Surface(key[0])
+            if pygame.display.get_surface():
+                surface = surface.convert()
+            surface.fill(color)
+            surface.set_alpha(alpha)
+            self.surfaces.put(key, surface)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+overlay_pool = SurfacePool()
+
+def get_overlay(size, color, alpha):
+    """A size surface filled with color, blended at the given alpha"""
+    return overlay_pool.get(size, color, alpha)
+
+def clear_overlays():
+    # Old window sizes are never asked for again after a resize
+    overlay_pool.clear()
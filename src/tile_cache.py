@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pygame
+
+from utils import LRUCache, get_asset_path
+
+# Enough room for every tile type at a handful of sizes (board, resized
+# board, scrolling background) before old sizes start being evicted
+MAX_CACHED_IMAGES = 34 * 8
+
+_MISSING = object()  # Cache miss, as opposed to a remembered failed load
+
+class TileImageCache:
+    """Process-wide cache of decoded and scaled tile images"""
+    def __init__(self, max_entries=MAX_CACHED_IMAGES):
+        self.sources = {}
+        self.scaled = LRUCache(max_entries)
+        self.levels = None  # Atlas levels from the manifest, smallest first
+        self.atlases = {}  # atlas file -> loaded image, None if it failed
+        # The preloader decodes on worker threads; files are still loaded once
+        self.load_lock = threading.Lock()
+
+    def load_manifest(self):
+        # The atlas is built by build_tile_atlas.py; without it every tile
+        # falls back to its SVG
+        with self.load_lock:
+            if self.levels is None:
+                try:
+                    with open(get_asset_path("atlas", "manifest.json")) as f:
+                        manifest = json.load(f)
+                    self.levels = sorted(manifest["levels"], key=lambda level: level["width"])
+                except (IOError, OSError, ValueError, KeyError):
+                    self.levels = []
+            return self.levels
+
+    def pick_level(self, width, height):
+        # Smallest level that only needs scaling down, else the largest
+        levels = self.load_manifest()
+        for level in levels:
+            if level["width"] >= width and level["height"] >= height:
+                return level
+        return levels[-1] if levels else None
+
+    def load_atlas(self, filename):
+        with self.load_lock:
+            if filename not in self.atlases:
+                try:
+                    atlas = pygame.image.load(get_asset_path("atlas", filename))
+                    if pygame.display.get_surface():
+                        atlas = atlas.convert_alpha()
+                    self.atlases[filename] = atlas
+                except (pygame.error, IOError, OSError, FileNotFoundError):
+                    self.atlases[filename] = None
+            return self.atlases[filename]
+
+    def load_atlas_image(self, tile_type, width, height):
+        # Subsurface of the atlas level best suited to the requested size
+        level = self.pick_level(width, height)
+        if level is None:
+            return None
+        rect = level["tiles"].get(str(tile_type))
+        atlas = self.load_atlas(level["file"])
+        if rect is None or atlas is None:
+            return None
+        return atlas.subsurface(rect)
+
+    def load_source(self, tile_type):
+        # Decode each SVG once; a failed load is remembered as None so a
+        # missing asset is not retried on every lookup
+        with self.load_lock:
+            if tile_type not in self.sources:
+                try:
+                    image_path = get_asset_path("tiles", f"{tile_type}.svg")
+                    self.sources[tile_type] = pygame.image.load(image_path)
+                except (pygame.error, IOError, OSError, FileNotFoundError):
+                    self.sources[tile_type] = None
+            return self.sources[tile_type]
+
+    def get(self, tile_type, width, height, alpha=None):
+        # Images are shared between tiles, so callers must not modify them.
+        # Translucent variants are cached separately under their alpha value.
+        key = (tile_type, width, height) if alpha is None else (tile_type, width, height, alpha)
+        image = self.scaled.get(key, _MISSING)
+        if image is not _MISSING:
+            return image
+
+        source = self.load_atlas_image(tile_type, width, height)
+        if source is None:
+            source = self.load_source(tile_type)
+        image = None
+        if source is not None:
+            if source.get_size() == (width, height):
+                # Own copy, so the atlas is not kept alive by a subsurface
+                image = source.copy()
+            else:
+                image = pygame.transform.scale(source, (width, height))
+            if alpha is not None:
+                image.set_alpha(alpha)
+        self.scaled.put(key, image)
+        return image
+
+    def clear(self):
+        with self.load_lock:
+            self.sources.clear()
+            self.levels = None
+            self.atlases.clear()
+        self.scaled.clear()
+
+tile_image_cache = TileImageCache()
+
+def get_tile_image(tile_type, width, height, alpha=None):
+    """Get the shared image for a tile type at the given size"""
+    return tile_image_cache.get(tile_type, width, height, alpha)
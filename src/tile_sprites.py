@@ -0,0 +1,81 @@
+import pygame
+
+from font_utils import get_default_font
+from surface_pool import get_overlay
+from tile_cache import get_tile_image
+from utils import LRUCache
+
+# Normal and selected sprites for every tile type at a few sizes
+MAX_CACHED_SPRITES = 34 * 4
+
+# Fallback colors used when a tile's SVG cannot be loaded
+FALLBACK_COLORS = [
+    (255, 0, 0),    # Red
+    (0, 255, 0),    # Green
+    (0, 0, 255),    # Blue
+    (255, 255, 0),  # Yellow
+    (255, 0, 255),  # Magenta
+    (0, 255, 255),  # Cyan
+    (255, 128, 0),  # Orange
+    (128, 0, 255),  # Purple
+]
+
+def compose_tile(tile_type, width, height):
+    surface = pygame.Surface((width, height))
+    rect = surface.get_rect()
+
+    # Slightly smaller image area so the border stays visible
+    image = get_tile_image(tile_type, max(width - 4, 1), max(height - 4, 1))
+    if image:
+        # White background for tile
+        pygame.draw.rect(surface, (255, 255, 255), rect)
+        pygame.draw.rect(surface, (180, 180, 180), rect, 2)
+        surface.blit(image, rect.inflate(-4, -4).topleft)
+    else:
+        # Colored tile based on tile type
+        base_color = FALLBACK_COLORS[tile_type % len(FALLBACK_COLORS)]
+        pygame.draw.rect(surface, base_color, rect)
+        pygame.draw.rect(surface, (200, 200, 200), rect, 2)
+
+        # Tile number with a shadow for better readability
+        font = get_default_font(36)
+        text = font.render(str(tile_type), True, (255, 255, 255))
+        text_rect = text.get_rect(center=rect.center)
+        shadow_text = font.render(str(tile_type), True, (0, 0, 0))
+        surface.blit(shadow_text, text_rect.move(2, 2))
+        surface.blit(text, text_rect)
+    return surface
+
+def compose_selected(normal):
+    surface = normal.copy()
+    surface.blit(get_overlay(surface.get_size(), (255, 255, 0), 100), (0, 0))
+    pygame.draw.rect(surface, (255, 255, 0), surface.get_rect(), 3)
+    return surface
+
+class TileSpriteCache:
+    """Finished (normal, selected) tile sprites per type and size"""
+    def __init__(self, max_entries=MAX_CACHED_SPRITES):
+        self.sprites = LRUCache(max_entries)
+
+    def get(self, tile_type, width, height):
+        key = (tile_type, width, height)
+        sprites = self.sprites.get(key)
+        if sprites is None:
+            normal = compose_tile(tile_type, width, height)
+            selected = compose_selected(normal)
+            if pygame.display.get_surface() is not None:
+                # Match the display format so each draw is a plain blit
+                normal = normal.convert()
+                selected = selected.convert()
+            sprites = (normal, selected)
+            self.sprites.put(key, sprites)
+        return sprites
+
+    def clear(self):
+        self.sprites.clear()
+
+tile_sprite_cache = TileSpriteCache()
+
+def get_tile_sprites(tile_type, width, height):
+    """Get the (normal, selected) sprites for a tile type at the given size"""
+    return tile_sprite_cache.get(tile_type, width, height)
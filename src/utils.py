@@ -1,5 +1,7 @@
 import os
 import sys
+import threading
+from collections import OrderedDict
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -13,4 +15,39 @@ def get_resource_path(relative_path):
 
 def get_asset_path(asset_type, filename):
     """Get path to specific asset file"""
-    return get_resource_path(os.path.join("assets", asset_type, filename))
\ No newline at end of file
+    return get_resource_path(os.path.join("assets", asset_type, filename))
+
+class LRUCache:
+    """
+    Small bounded mapping that evicts the least recently used entry.
+    Safe to share with the asset preloader threads.
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return default
+            return self._entries[key]
+    
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        
+    def __contains__(self, key):
+        return key in self._entries
+    
+    def __len__(self):
+        return len(self._entries)